@@ -7,6 +7,7 @@ Always generates a fictional competitor - no external search.
 
 import logging
 import json
+from functools import partial
 from typing import Dict, Any, Tuple, List
 
 
@@ -203,8 +204,9 @@ Output ONLY the JSON, no other text."""
     ) -> Dict[str, Any]:
         """Generate comparison logic blocks with cross-block analysis."""
         from logic_blocks import (
-            generate_benefits_block, 
-            generate_safety_block
+            generate_benefits_blocks_bulk,
+            generate_safety_block,
+            run_blocks
         )
         from logic_blocks.cross_block_analyzer import (
             analyze_benefit_safety_conflicts,
@@ -213,19 +215,27 @@ Output ONLY the JSON, no other text."""
         
         logger.debug(f"{self.name}: Generating comparison blocks")
         
-        # Generate individual blocks for both products
-        benefits_a = generate_benefits_block(product_a)
-        safety_a = generate_safety_block(product_a)
-        benefits_b = generate_benefits_block(product_b)
-        safety_b = generate_safety_block(product_b)
+        # Generate individual and comparison blocks for both products
+        # concurrently; each is an independent LLM call, and both products'
+        # benefits are scored in a single bulk call
+        results = run_blocks({
+            "benefits": partial(generate_benefits_blocks_bulk, [product_a, product_b]),
+            "safety_a": partial(generate_safety_block, product_a),
+            "safety_b": partial(generate_safety_block, product_b),
+            "compare_ingredients": partial(compare_ingredients_block, product_a, product_b),
+            "compare_benefits": partial(compare_benefits_block, product_a, product_b),
+        })
+        benefits_a, benefits_b = results["benefits"]
+        safety_a = results["safety_a"]
+        safety_b = results["safety_b"]
         
         # Cross-block analysis for both products
         conflicts_a = analyze_benefit_safety_conflicts(benefits_a, safety_a)
         conflicts_b = analyze_benefit_safety_conflicts(benefits_b, safety_b)
         
         return {
-            "compare_ingredients_block": compare_ingredients_block(product_a, product_b),
-            "compare_benefits_block": compare_benefits_block(product_a, product_b),
+            "compare_ingredients_block": results["compare_ingredients"],
+            "compare_benefits_block": results["compare_benefits"],
             "pricing_block": generate_pricing_block(product_a, product_b),
             "cross_block_analysis": {
                 "product_a": {
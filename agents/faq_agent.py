@@ -7,15 +7,18 @@ Single responsibility: Select questions and generate answers using logic blocks.
 
 import logging
 import json
+import re
+from functools import partial
 from typing import List, Dict, Any, Tuple
 
 
 from models import ProductModel, QuestionModel, QuestionCategory
-from config import invoke_with_retry, invoke_with_metrics
+from config import invoke_with_retry, invoke_with_metrics, should_store_prompts
 from logic_blocks import (
     generate_benefits_block,
     generate_usage_block,
-    generate_safety_block
+    generate_safety_block,
+    run_blocks
 )
 
 
@@ -50,6 +53,9 @@ CATEGORY_SCORES = {
     QuestionCategory.PURCHASE: 1.0,
 }
 
+# Product-specific phrases that earn a specificity bonus
+SPECIFIC_TERMS_RE = re.compile(r"this product|the serum|this serum", re.IGNORECASE)
+
 
 class FAQAgent:
     """
@@ -110,10 +116,13 @@ class FAQAgent:
             blocks = self._generate_blocks(product)
             
             # Generate answers for each question with metrics tracking
+            store_prompts = should_store_prompts(logger)
             faq_items = []
             answer_scores = []
             for question in selected:
-                answer, blocks_used, call_metrics = self._generate_answer(product, question, blocks)
+                answer, blocks_used, call_metrics, prompt_text = self._generate_answer(
+                    product, question, blocks
+                )
                 faq_items.append({
                     "id": question.id,
                     "category": question.category.value,
@@ -128,8 +137,8 @@ class FAQAgent:
                     agent_metrics["tokens_in"] += call_metrics.get("tokens_in", 0)
                     agent_metrics["tokens_out"] += call_metrics.get("tokens_out", 0)
                     agent_metrics["output_len"] += call_metrics.get("output_len", 0)
-                    if "prompt_hash" in call_metrics:
-                        agent_metrics["prompts"][call_metrics["prompt_hash"]] = call_metrics.get("prompt_text", "")
+                    if store_prompts and "prompt_hash" in call_metrics:
+                        agent_metrics["prompts"][call_metrics["prompt_hash"]] = prompt_text
             
             # Add answer quality metrics
             if answer_scores:
@@ -268,8 +277,7 @@ class FAQAgent:
         score += CATEGORY_SCORES.get(question.category, 1.0)
         
         # Specificity bonus (questions with product-specific terms)
-        q_lower = question.question.lower()
-        if any(term in q_lower for term in ["this product", "the serum", "this serum"]):
+        if SPECIFIC_TERMS_RE.search(question.question):
             score += 0.5
         
         return score
@@ -278,9 +286,15 @@ class FAQAgent:
         """Generate all logic blocks for answer generation with cross-block analysis."""
         from logic_blocks.cross_block_analyzer import analyze_benefit_safety_conflicts
         
-        benefits = generate_benefits_block(product)
-        usage = generate_usage_block(product)
-        safety = generate_safety_block(product)
+        # Independent LLM-backed blocks run concurrently
+        results = run_blocks({
+            "benefits": partial(generate_benefits_block, product),
+            "usage": partial(generate_usage_block, product),
+            "safety": partial(generate_safety_block, product),
+        })
+        benefits = results["benefits"]
+        usage = results["usage"]
+        safety = results["safety"]
         
         # Cross-block analysis for deeper insights
         conflicts = analyze_benefit_safety_conflicts(benefits, safety)
@@ -297,7 +311,7 @@ class FAQAgent:
         product: ProductModel, 
         question: QuestionModel,
         blocks: Dict[str, Any]
-    ) -> Tuple[str, List[str]]:
+    ) -> Tuple[str, List[str], Dict[str, Any], str]:
         """
         Generate answer for a question using LLM and logic blocks.
         
@@ -307,7 +321,8 @@ class FAQAgent:
             blocks: Pre-generated logic blocks
             
         Returns:
-            Tuple of (answer text, list of logic blocks used)
+            Tuple of (answer text, list of logic blocks used, call metrics,
+            prompt text as returned by invoke_with_metrics; "" on fallback)
         """
         blocks_used = []
         
@@ -347,16 +362,15 @@ class FAQAgent:
                 "tokens_in": metrics.get("tokens_in", 0),
                 "tokens_out": metrics.get("tokens_out", 0),
                 "output_len": metrics.get("output_len", 0),
-                "prompt_hash": metrics.get("prompt_hash", ""),
-                "prompt_text": prompt_text
+                "prompt_hash": metrics.get("prompt_hash", "")
             }
             
-            return answer, blocks_used, call_metrics
+            return answer, blocks_used, call_metrics, prompt_text
             
         except Exception as e:
             logger.error(f"{self.name}: Error generating answer: {e}")
             # Return fallback answer with empty metrics
-            return self._fallback_answer(product, question), blocks_used, {}
+            return self._fallback_answer(product, question), blocks_used, {}, ""
     
     def _build_answer_prompt(
         self, 
@@ -41,6 +41,9 @@ class OutputAgent:
             output_dir: Directory to write output files
         """
         self.output_dir = output_dir
+        # File name -> rendered document, kept so callers can use the output
+        # without re-reading the files just written
+        self.documents: Dict[str, Dict[str, Any]] = {}
         self._ensure_output_dir()
         logger.info(f"Initialized {self.name}, output dir: {self.output_dir}")
     
@@ -155,8 +158,11 @@ class OutputAgent:
     
     def _write_json(self, filepath: str, data: Dict[str, Any]) -> None:
         """Write data to JSON file with pretty formatting."""
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Serialize up front and write once; json.dump issues a write per token
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        with open(filepath, "wb") as f:
+            f.write(payload)
+        self.documents[os.path.basename(filepath)] = data
     
     def get_output_paths(self) -> Dict[str, str]:
         """Get paths to all output files."""
@@ -6,6 +6,7 @@ Single responsibility: Build complete product page using logic blocks.
 """
 
 import logging
+from functools import partial
 from typing import Dict, Any, Tuple, List
 
 
@@ -15,7 +16,8 @@ from logic_blocks import (
     generate_benefits_block,
     generate_usage_block,
     generate_ingredients_block,
-    generate_safety_block
+    generate_safety_block,
+    run_blocks
 )
 
 
@@ -113,10 +115,17 @@ class ProductPageAgent:
         
         logger.debug(f"{self.name}: Generating logic blocks")
         
-        benefits = generate_benefits_block(product)
-        usage = generate_usage_block(product)
-        ingredients = generate_ingredients_block(product)
-        safety = generate_safety_block(product)
+        # Independent LLM-backed blocks run concurrently
+        results = run_blocks({
+            "benefits": partial(generate_benefits_block, product),
+            "usage": partial(generate_usage_block, product),
+            "ingredients": partial(generate_ingredients_block, product),
+            "safety": partial(generate_safety_block, product),
+        })
+        benefits = results["benefits"]
+        usage = results["usage"]
+        ingredients = results["ingredients"]
+        safety = results["safety"]
         
         # Cross-block analysis for deeper insights
         benefit_safety = analyze_benefit_safety_conflicts(benefits, safety)
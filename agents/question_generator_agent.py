@@ -7,21 +7,56 @@ Single responsibility: Generate 15+ questions in 5 categories.
 
 import logging
 import json
-from typing import List, Dict, Any, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple, Mapping
 
 
 from models import ProductModel, QuestionModel, QuestionCategory
-from config import invoke_with_retry, invoke_with_metrics
+from config import (
+    QUESTION_SOFT_DEADLINE_S,
+    invoke_with_retry,
+    invoke_with_metrics,
+    should_store_prompts
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for the initial LLM call when a soft deadline is set, so a
+# slow response can be abandoned without blocking the agent. An abandoned
+# call still runs to completion on its worker; it is bounded by the client's
+# 60s read timeout per attempt plus retry backoff (4 attempts), so a worker
+# is held for a few minutes at worst. While all four workers are held, new
+# calls queue and simply hit their own deadline and serve templates.
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="question_llm")
+
+
+def _question_key(text: str) -> str:
+    """
+    Normalize question text for duplicate detection.
+    
+    Lowercases and strips all non-word characters so that trivial variants
+    ("What is X?" vs "what is x") map to the same key.
+    """
+    return re.sub(r'\W+', '', text.lower())
+
+
+# Every accepted spelling of a category (value, lowercase value, lowercase
+# enum name) mapped to its enum member, built once at import.
+_CATEGORY_LOOKUP: Mapping[str, QuestionCategory] = MappingProxyType({
+    **{cat.value: cat for cat in QuestionCategory},
+    **{cat.value.lower(): cat for cat in QuestionCategory},
+    **{cat.name.lower(): cat for cat in QuestionCategory},
+})
+
 
 def _to_question_category(raw: str) -> QuestionCategory:
     """
     Map a free-form category string to a QuestionCategory enum.
     
-    Tries exact value match, case-insensitive value, then enum name,
+    Tries exact value match, then case-insensitive value or enum name,
     and defaults to INFORMATIONAL if no match is found.
     
     Args:
@@ -33,25 +68,7 @@ def _to_question_category(raw: str) -> QuestionCategory:
     if not raw:
         return QuestionCategory.INFORMATIONAL
     s = str(raw).strip()
-    
-    # 1) Exact value match
-    for cat in QuestionCategory:
-        if s == cat.value:
-            return cat
-    
-    # 2) Case-insensitive value match
-    s_lower = s.lower()
-    for cat in QuestionCategory:
-        if s_lower == cat.value.lower():
-            return cat
-    
-    # 3) Enum name match (e.g., "informational" -> INFORMATIONAL)
-    for cat in QuestionCategory:
-        if s_lower == cat.name.lower():
-            return cat
-    
-    # Default fallback
-    return QuestionCategory.INFORMATIONAL
+    return _CATEGORY_LOOKUP.get(s) or _CATEGORY_LOOKUP.get(s.lower(), QuestionCategory.INFORMATIONAL)
 
 
 class QuestionGeneratorAgent:
@@ -68,13 +85,18 @@ class QuestionGeneratorAgent:
     Attributes:
         name: Agent identifier
         min_questions: Minimum number of questions to generate
+        soft_deadline_s: Seconds to wait for the LLM before serving templates;
+            None waits for the LLM (default from QUESTION_SOFT_DEADLINE_S)
     """
     
     name: str = "question_generator_agent"
     min_questions: int = 15
     
-    def __init__(self):
+    def __init__(self, soft_deadline_s: Optional[float] = None):
         """Initialize the Question Generator Agent."""
+        if soft_deadline_s is None and QUESTION_SOFT_DEADLINE_S > 0:
+            soft_deadline_s = QUESTION_SOFT_DEADLINE_S
+        self.soft_deadline_s = soft_deadline_s
         logger.info(f"Initialized {self.name}")
     
     def execute(self, product: ProductModel) -> Tuple[List[QuestionModel], List[str]]:
@@ -83,7 +105,10 @@ class QuestionGeneratorAgent:
         
         Uses Groq LLM to generate at least 15 questions across 5 different 
         categories. Includes automatic retry logic with LLM regeneration and 
-        template-based fallback to meet minimum question count.
+        template-based fallback to meet minimum question count. If
+        ``soft_deadline_s`` is set and the LLM has not answered in time,
+        template questions are returned instead and a warning is added to
+        ``agent_metrics["warnings"]``.
         
         Args:
             product: Validated ProductModel
@@ -94,21 +119,38 @@ class QuestionGeneratorAgent:
         logger.info(f"{self.name}: Generating questions for {product.name}")
         errors: List[str] = []
         questions: List[QuestionModel] = []
-        agent_metrics = {"tokens_in": 0, "tokens_out": 0, "output_len": 0, "prompts": {}}
+        agent_metrics = {"tokens_in": 0, "tokens_out": 0, "output_len": 0, "prompts": {}, "warnings": []}
         
         try:
             # Generate questions using LLM with metrics tracking
             prompt = self._build_prompt(product)
             logger.debug(f"{self.name}: Calling Groq for question generation")
             
-            # Use invoke_with_metrics for automatic metrics tracking
-            raw_response, metrics, prompt_text = invoke_with_metrics(prompt)
+            # Use invoke_with_metrics for automatic metrics tracking. With a
+            # soft deadline the call runs on a worker so a slow LLM is
+            # bounded by it; without one it runs inline.
+            if self.soft_deadline_s is None:
+                raw_response, metrics, prompt_text = invoke_with_metrics(prompt)
+            else:
+                llm_future = _LLM_EXECUTOR.submit(invoke_with_metrics, prompt)
+                done, _ = wait([llm_future], timeout=self.soft_deadline_s)
+                if not done:
+                    warning = (
+                        f"LLM exceeded soft deadline of {self.soft_deadline_s:.1f}s, "
+                        f"serving template questions"
+                    )
+                    logger.warning(f"{self.name}: {warning}")
+                    agent_metrics["warnings"].append(warning)
+                    questions = self._template_fallback_questions(product, 0, self.min_questions)
+                    return questions, errors, agent_metrics
+                raw_response, metrics, prompt_text = llm_future.result()
             
             # Aggregate metrics
             agent_metrics["tokens_in"] += metrics.get("tokens_in", 0)
             agent_metrics["tokens_out"] += metrics.get("tokens_out", 0)
             agent_metrics["output_len"] += metrics.get("output_len", 0)
-            agent_metrics["prompts"][metrics["prompt_hash"]] = prompt_text
+            if should_store_prompts(logger):
+                agent_metrics["prompts"][metrics["prompt_hash"]] = prompt_text
             
             # Parse the response
             questions = self._parse_response(raw_response, product)
@@ -191,7 +233,6 @@ IMPORTANT:
             response = response.strip()
             
             # Robust JSON extraction: find JSON array even with leading/trailing text
-            import re
             json_match = re.search(r'\[.*\]', response, re.DOTALL)
             if json_match:
                 response = json_match.group()
@@ -223,9 +264,17 @@ IMPORTANT:
                     )
                     return self._generate_fallback_questions(product)
             
-            # Convert to QuestionModels using _to_question_category helper
+            # Convert to QuestionModels using _to_question_category helper,
+            # skipping questions that normalize to one already seen
+            seen: set = set()
             for i, item in enumerate(parsed):
                 if isinstance(item, dict) and "question" in item:
+                    key = _question_key(str(item["question"]))
+                    if key in seen:
+                        logger.debug("%s: Skipping duplicate question %d", self.name, i + 1)
+                        continue
+                    seen.add(key)
+                    
                     category_str = item.get("category", "Informational")
                     category = _to_question_category(category_str)
                     
@@ -341,16 +390,21 @@ Output ONLY a JSON array: [{{"category": "X", "question": "Y?"}}]"""
         response = response.strip()
         
         # Robust JSON extraction
-        import re
         json_match = re.search(r'\[.*\]', response, re.DOTALL)
         if json_match:
             response = json_match.group()
         
         data = json.loads(response)
         
+        # Drop anything that repeats an existing question (or another new one)
+        seen = {_question_key(q) for q in existing_questions}
         questions = []
         for i, item in enumerate(data):
             if isinstance(item, dict) and "question" in item:
+                key = _question_key(str(item["question"]))
+                if key in seen:
+                    continue
+                seen.add(key)
                 category = _to_question_category(item.get("category", "Informational"))
                 questions.append(QuestionModel(
                     id=f"q_regen_{i+1}",
@@ -404,7 +458,8 @@ Output ONLY a JSON array: [{{"category": "X", "question": "Y?"}}]"""
             for q in questions:
                 if len(additional) >= needed:
                     break
-                additional.append(QuestionModel(
+                # Templates are trusted literals ending in "?", so skip validation
+                additional.append(QuestionModel.model_construct(
                     id=f"q{idx + len(additional) + 1}",
                     category=category,
                     question=q
@@ -469,24 +524,25 @@ Output ONLY valid JSON array."""
                 if attempt < max_attempts - 1:
                     continue  # Retry
         
-        # Absolute minimal fallback with 15 questions (only if all retries fail)
+        # Absolute minimal fallback with 15 questions (only if all retries fail).
+        # Built via model_construct: the literals below are already well-formed.
         logger.warning(f"{self.name}: All fallback attempts failed, using template questions")
         return [
-            QuestionModel(id="q1", category=QuestionCategory.INFORMATIONAL, question=f"What is {product.name}?"),
-            QuestionModel(id="q2", category=QuestionCategory.INFORMATIONAL, question=f"What does {product.name} do?"),
-            QuestionModel(id="q3", category=QuestionCategory.INFORMATIONAL, question=f"What are the key features of {product.name}?"),
-            QuestionModel(id="q4", category=QuestionCategory.USAGE, question=f"How do I use {product.name}?"),
-            QuestionModel(id="q5", category=QuestionCategory.USAGE, question=f"How often should I use {product.name}?"),
-            QuestionModel(id="q6", category=QuestionCategory.USAGE, question=f"When is the best time to use {product.name}?"),
-            QuestionModel(id="q7", category=QuestionCategory.SAFETY, question=f"Are there any issues with {product.name}?"),
-            QuestionModel(id="q8", category=QuestionCategory.SAFETY, question=f"Who should not use {product.name}?"),
-            QuestionModel(id="q9", category=QuestionCategory.SAFETY, question=f"What precautions should I take with {product.name}?"),
-            QuestionModel(id="q10", category=QuestionCategory.PURCHASE, question=f"What is the price of {product.name}?"),
-            QuestionModel(id="q11", category=QuestionCategory.PURCHASE, question=f"Is {product.name} worth the price?"),
-            QuestionModel(id="q12", category=QuestionCategory.PURCHASE, question=f"Where can I buy {product.name}?"),
-            QuestionModel(id="q13", category=QuestionCategory.COMPARISON, question=f"How does {product.name} compare to alternatives?"),
-            QuestionModel(id="q14", category=QuestionCategory.COMPARISON, question=f"What makes {product.name} different from competitors?"),
-            QuestionModel(id="q15", category=QuestionCategory.COMPARISON, question=f"Is {product.name} better than similar products?"),
+            QuestionModel.model_construct(id="q1", category=QuestionCategory.INFORMATIONAL, question=f"What is {product.name}?"),
+            QuestionModel.model_construct(id="q2", category=QuestionCategory.INFORMATIONAL, question=f"What does {product.name} do?"),
+            QuestionModel.model_construct(id="q3", category=QuestionCategory.INFORMATIONAL, question=f"What are the key features of {product.name}?"),
+            QuestionModel.model_construct(id="q4", category=QuestionCategory.USAGE, question=f"How do I use {product.name}?"),
+            QuestionModel.model_construct(id="q5", category=QuestionCategory.USAGE, question=f"How often should I use {product.name}?"),
+            QuestionModel.model_construct(id="q6", category=QuestionCategory.USAGE, question=f"When is the best time to use {product.name}?"),
+            QuestionModel.model_construct(id="q7", category=QuestionCategory.SAFETY, question=f"Are there any issues with {product.name}?"),
+            QuestionModel.model_construct(id="q8", category=QuestionCategory.SAFETY, question=f"Who should not use {product.name}?"),
+            QuestionModel.model_construct(id="q9", category=QuestionCategory.SAFETY, question=f"What precautions should I take with {product.name}?"),
+            QuestionModel.model_construct(id="q10", category=QuestionCategory.PURCHASE, question=f"What is the price of {product.name}?"),
+            QuestionModel.model_construct(id="q11", category=QuestionCategory.PURCHASE, question=f"Is {product.name} worth the price?"),
+            QuestionModel.model_construct(id="q12", category=QuestionCategory.PURCHASE, question=f"Where can I buy {product.name}?"),
+            QuestionModel.model_construct(id="q13", category=QuestionCategory.COMPARISON, question=f"How does {product.name} compare to alternatives?"),
+            QuestionModel.model_construct(id="q14", category=QuestionCategory.COMPARISON, question=f"What makes {product.name} different from competitors?"),
+            QuestionModel.model_construct(id="q15", category=QuestionCategory.COMPARISON, question=f"Is {product.name} better than similar products?"),
         ]
 
 
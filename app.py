@@ -9,23 +9,56 @@ Provides a user interface to:
 """
 
 import streamlit as st
+import pandas as pd
 import json
-import time
-from datetime import datetime
+import hashlib
 import os
+import re
 import sys
 from typing import Tuple, Optional, Dict, Any
 import asyncio
-import nest_asyncio
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
-# Apply nest_asyncio to allow nested event loops in Streamlit
-nest_asyncio.apply()
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib
+    orjson = None
+
+# Reused by the stdlib fallback so validation does not rebuild a decoder
+_JSON_DECODER = json.JSONDecoder()
 
 # Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+# Output locations, resolved once instead of on every rerun
+OUTPUT_PATH = os.path.join(BASE_DIR, "output")
+OUTPUT_JSON_NAMES = ("faq.json", "product_page.json", "comparison_page.json")
+OUTPUT_JSON_PATHS = tuple(os.path.join(OUTPUT_PATH, name) for name in OUTPUT_JSON_NAMES)
+PREVIEW_PATH = os.path.join(OUTPUT_PATH, "preview.html")
+
+# Session logs are a ring buffer; the UI only ever shows the tail
+MAX_LOG_LINES = 256
+
+# The worker's progress callback only records state; the progress panel
+# renders it at this interval, however often the workflow reports.
+PROGRESS_POLL_INTERVAL_S = 0.5
+
+# Text Fields input: fields a product must have, and those entered as comma lists
+REQUIRED_FIELDS = frozenset({
+    "name", "product_type", "target_users", "key_features",
+    "benefits", "how_to_use", "considerations", "price",
+})
+LIST_FIELDS = frozenset({"target_users", "key_features", "benefits"})
+
+# Background workflows from all sessions share one pool, which bounds the
+# number of concurrent runs (and their Groq traffic) per server process
+MAX_CONCURRENT_WORKFLOWS = 4
 
 from models import EXAMPLE_PRODUCT_DATA
-from orchestrator import run_workflow
 
 
 # Page configuration
@@ -36,8 +69,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for modern styling
-st.markdown("""
+# Custom CSS for modern styling. Streamlit drops elements that a rerun does
+# not emit, so this is re-sent each rerun; keep it to the classes in use.
+APP_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -52,35 +86,21 @@ st.markdown("""
         color: #666;
         margin-top: 0;
     }
-    .success-box {
-        background-color: #E8F5E9;
-        border-left: 4px solid #4CAF50;
-        padding: 1rem;
-        border-radius: 4px;
-    }
-    .error-box {
-        background-color: #FFEBEE;
-        border-left: 4px solid #F44336;
-        padding: 1rem;
-        border-radius: 4px;
-    }
-    .agent-step {
-        padding: 0.5rem 1rem;
-        margin: 0.25rem 0;
-        border-radius: 4px;
-        background-color: #F5F5F5;
-    }
     .stProgress > div > div > div {
         background: linear-gradient(90deg, #6b7280 0%, #4b5563 100%);
     }
-    .metric-card {
-        background: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        text-align: center;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_workflow_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for background workflow runs, kept across reruns and sessions."""
+    return ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_WORKFLOWS,
+        thread_name_prefix="workflow"
+    )
 
 
 def init_session_state():
@@ -90,17 +110,45 @@ def init_session_state():
     if "results" not in st.session_state:
         st.session_state.results = None
     if "logs" not in st.session_state:
-        st.session_state.logs = []
+        st.session_state.logs = deque(maxlen=MAX_LOG_LINES)
     if "current_step" not in st.session_state:
         st.session_state.current_step = ""
     if "show_preview" not in st.session_state:
         st.session_state.show_preview = False
+    if "workflow_future" not in st.session_state:
+        st.session_state.workflow_future = None
+    if "preview_written" not in st.session_state:
+        st.session_state.preview_written = None  # (digest, size) of output/preview.html
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return _JSON_DECODER.decode(data)
+
+
+def _json_dump_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` as 2-space indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize ``obj`` as 2-space indented JSON text."""
+    return _json_dump_bytes(obj).decode('utf-8')
 
 
 def validate_json(json_str: str) -> Tuple[Optional[Dict], Optional[str]]:
     """Validate JSON input structure only (not field names)."""
+    if not json_str or json_str.isspace():
+        return None, "Input cannot be empty"
+    
     try:
-        data = json.loads(json_str)
+        data = _json_loads(json_str)
         if not isinstance(data, dict):
             return None, "Input must be a JSON object"
         
@@ -108,94 +156,134 @@ def validate_json(json_str: str) -> Tuple[Optional[Dict], Optional[str]]:
             return None, "JSON object cannot be empty"
         
         return data, None
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
         return None, f"Invalid JSON syntax: {str(e)}"
 
 
-def run_generation(product_data: Dict[str, Any]):
-    """Run the multi-agent workflow."""
-    st.session_state.workflow_running = True
-    st.session_state.logs = []
+def _execute_workflow(product_data: Dict[str, Any], progress_callback) -> Dict[str, Any]:
+    """Worker-thread entry point: run the async workflow on a fresh event loop.
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    Also renders the preview page while still off the script thread and
+    returns it as ``result["preview"]``, so the results render only embeds it.
+    """
+    # Imported on first run: LangGraph and the agents are not needed to render the page
+    from orchestrator import arun_workflow
     
-    steps = [
-        ("🔄 Parser Agent", "Validating product data..."),
-        ("🔄 Parser Agent", "Parsing product data...", 20),
-        ("🔄 Question Generator", "Generating user questions...", 40),
-        ("🔄 FAQ Agent", "Creating FAQ content...", 60),
-        ("🔄 Product Page Agent", "Building product page...", 80),
-        ("🔄 Comparison Agent", "Generating comparison...", 95),
-        ("✅ Complete", "Saving JSON files...", 100)
-    ]
+    result = asyncio.run(arun_workflow(product_data, progress_callback))
+    
+    documents = result.get("output_documents")
+    if documents:
+        faq_data, product_data, comparison_data = (
+            documents.get(name, {}) for name in OUTPUT_JSON_NAMES
+        )
+        try:
+            result["preview"] = _build_preview_html(product_data, faq_data, comparison_data)
+        except Exception:
+            pass  # Rendered again, and any error shown, by the preview panel
+    return result
+
+
+def run_generation(product_data: Dict[str, Any]):
+    """Start the multi-agent workflow in the background.
     
-    # Create a placeholder for real-time log updates in sidebar
-    log_placeholder = st.sidebar.empty()
+    The workflow runs on the shared workflow pool so the script thread is
+    free to keep rendering; ``workflow_progress_panel`` polls the future.
+    """
+    # Shared with the worker thread, which must not touch Streamlit APIs
+    progress_state = {
+        "step": "Starting workflow...",
+        "pct": 0.05,
+        "logs": deque(maxlen=MAX_LOG_LINES),
+        "metrics": {},
+        "lock": threading.Lock(),
+    }
     
     def progress_callback(step: str, progress: float, metrics: Dict[str, Any] = None):
         """Callback for workflow progress updates.
 
-        Uses the numeric progress reported by the workflow and ensures the
-        Streamlit progress bar is **monotonic** (never moves backwards).
+        Uses the numeric progress reported by the workflow and keeps the
+        progress **monotonic** (never moves backwards).
         """
-        log_entry = f"{step}"
-        st.session_state.logs.append(log_entry)
-        st.session_state.current_step = step
-
-        # Aggregate per-node metrics into session state
-        if metrics:
-            if "workflow_metrics" not in st.session_state:
-                st.session_state.workflow_metrics = {}
-            st.session_state.workflow_metrics.update(metrics)
-
-        # Initialize last_progress in session state
-        if "last_progress" not in st.session_state:
-            st.session_state.last_progress = 0.0
-
-        # Clamp progress between 0 and 1 and enforce monotonicity
-        pct = max(0.0, min(1.0, float(progress)))
-        if pct < st.session_state.last_progress:
-            pct = st.session_state.last_progress
-        st.session_state.last_progress = pct
-
-        # Update progress bar and status
-        progress_bar.progress(pct)
-        status_text.markdown(f"**{step}** ({int(pct * 100)}%)")
-
-        # Update logs display in sidebar (WITHOUT adding another header)
-        recent_logs = st.session_state.logs[-6:]
-        log_display = ""
-        for log in recent_logs:
-            display_log = log[:55] + "..." if len(log) > 55 else log
-            log_display += f"• {display_log}\n\n"
-        log_placeholder.markdown(log_display)
-    
-    # Run actual workflow with real progress
-    status_text.markdown("**Starting workflow...**")
-    progress_bar.progress(0.05)
+        with progress_state["lock"]:
+            progress_state["logs"].append(f"{step}")
+            progress_state["step"] = step
+            
+            # Aggregate per-node metrics
+            if metrics:
+                progress_state["metrics"].update(metrics)
+            
+            # Clamp progress between 0 and 1 and enforce monotonicity
+            pct = max(0.0, min(1.0, float(progress)))
+            progress_state["pct"] = max(progress_state["pct"], pct)
+    
+    st.session_state.workflow_running = True
+    st.session_state.logs = deque(maxlen=MAX_LOG_LINES)
+    st.session_state.workflow_progress = progress_state
+    st.session_state.workflow_future = get_workflow_executor().submit(
+        _execute_workflow, product_data, progress_callback
+    )
+    st.rerun()
+
+
+def _log_tail(logs: deque, n: int = 6) -> list:
+    """Return the last ``n`` log lines, oldest first, without copying the whole buffer."""
+    return list(islice(reversed(logs), n))[::-1]
+
+
+def _render_log_tail(lines: list):
+    """Show log lines as one code block rather than one element per line."""
+    st.code(
+        "\n".join(log[:55] + "..." if len(log) > 55 else log for log in lines),
+        language=None
+    )
+
+
+def _collect_workflow_result():
+    """Move a finished background workflow's result into session state."""
+    future = st.session_state.workflow_future
+    progress_state = st.session_state.workflow_progress
+    st.session_state.workflow_future = None
+    st.session_state.workflow_running = False
+    st.session_state.logs = deque(progress_state["logs"], maxlen=MAX_LOG_LINES)
+    st.session_state.workflow_metrics = dict(progress_state["metrics"])
     
     try:
-        result = run_workflow(product_data, progress_callback)
+        result = future.result()
         st.session_state.results = result
         
         if result.get("errors"):
             st.session_state.logs.extend(result["errors"])
         
         st.session_state.logs.extend(result.get("logs", []))
-        progress_bar.progress(1.0)
-        status_text.markdown("**✅ Generation complete! (100%)**")
-        
     except Exception as e:
-        st.error(f"Workflow failed: {str(e)}")
+        st.session_state.workflow_error = f"Workflow failed: {str(e)}"
         st.session_state.logs.append(f"ERROR: {str(e)}")
+
+
+@st.fragment(run_every=PROGRESS_POLL_INTERVAL_S)
+def workflow_progress_panel():
+    """Poll the background workflow and render its live progress."""
+    future = st.session_state.get("workflow_future")
+    if future is None:
+        return
     
-    st.session_state.workflow_running = False
+    if future.done():
+        _collect_workflow_result()
+        st.rerun()
+    
+    progress_state = st.session_state.workflow_progress
+    with progress_state["lock"]:
+        pct = progress_state["pct"]
+        step = progress_state["step"]
+        recent_logs = _log_tail(progress_state["logs"])
+    
+    st.progress(pct)
+    st.markdown(f"**{step}** ({int(pct * 100)}%)")
+    if recent_logs:
+        _render_log_tail(recent_logs)
 
 
 # HTML Generation - extracted to services/html_generator.py
-from services import HtmlGenerator
-
 def generate_ecommerce_html(
     product_data: Dict[str, Any],
     faq_data: Dict[str, Any],
@@ -219,10 +307,206 @@ def generate_ecommerce_html(
     Returns:
         Complete HTML document as string
     """
+    from services import HtmlGenerator
+    
     generator = HtmlGenerator()
     return generator.generate(product_data, faq_data, comparison_data)
 
 
+def _read_output_json(path: str) -> Dict[str, Any]:
+    """Read one output JSON file, returning an empty dict if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+@st.cache_data(show_spinner=False)
+def _load_output_files(paths: Tuple[str, ...], mtimes: Tuple[float, ...]) -> Tuple[Dict[str, Any], ...]:
+    """Load the output JSON files concurrently.
+
+    ``mtimes`` is part of the cache key so rewritten files are reloaded.
+    """
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        return tuple(pool.map(_read_output_json, paths))
+
+
+@st.cache_data(show_spinner=False)
+def _default_product_json() -> str:
+    """Example product as editor text, serialized once rather than every rerun."""
+    return _json_dumps(EXAMPLE_PRODUCT_DATA)
+
+
+def _output_mtimes() -> Tuple[float, ...]:
+    """Return the output JSON files' mtimes (0.0 if missing) from one directory scan."""
+    try:
+        with os.scandir(OUTPUT_PATH) as entries:
+            found = {
+                entry.name: entry.stat().st_mtime
+                for entry in entries
+                if entry.name in OUTPUT_JSON_NAMES
+            }
+    except FileNotFoundError:
+        found = {}
+    return tuple(found.get(name, 0.0) for name in OUTPUT_JSON_NAMES)
+
+
+def _build_preview_html(
+    product_data: Dict[str, Any],
+    faq_data: Dict[str, Any],
+    comparison_data: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Render the ecommerce preview.
+    
+    Safe to call from the workflow thread: it touches no Streamlit APIs.
+    
+    Returns:
+        The HTML document and its blake2b digest
+    """
+    from services import HtmlGenerator
+    
+    html_content = HtmlGenerator().generate(product_data, faq_data, comparison_data)
+    digest = hashlib.blake2b(html_content.encode('utf-8'), digest_size=16).hexdigest()
+    return html_content, digest
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _render_preview_html(
+    product_data: Dict[str, Any],
+    faq_data: Dict[str, Any],
+    comparison_data: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Render the ecommerce preview, memoized on the three page dicts."""
+    return _build_preview_html(product_data, faq_data, comparison_data)
+
+
+def _write_preview(content_hash: str, html_content: str, path: str) -> str:
+    """Write the preview file unless this session already wrote this page.
+
+    The write is skipped only while the file on disk still has the size this
+    session wrote, so a file deleted or overwritten by another run is
+    written again.
+    """
+    written = st.session_state.get("preview_written")
+    if written is not None and written[0] == content_hash:
+        try:
+            if os.stat(path).st_size == written[1]:
+                return path
+        except FileNotFoundError:
+            pass
+    payload = html_content.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+    st.session_state.preview_written = (content_hash, len(payload))
+    return path
+
+
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Indentation and line breaks; whitespace without a newline is left alone
+# because a single space between inline elements is significant
+_HTML_LAYOUT_WS_RE = re.compile(r">\s*\n\s*<|\n\s+")
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _minified_preview(content_hash: str, _html_content: str) -> str:
+    """Strip comments and layout whitespace from the embedded preview.
+
+    Keyed on the page digest (the HTML itself is not hashed); the download
+    keeps the readable page.
+    """
+    html = _HTML_COMMENT_RE.sub("", _html_content)
+    return _HTML_LAYOUT_WS_RE.sub(lambda m: "><" if m.group(0)[0] == ">" else "\n", html)
+
+
+def _show_preview(
+    product_data: Dict[str, Any],
+    faq_data: Dict[str, Any],
+    comparison_data: Dict[str, Any]
+):
+    """Render the ecommerce preview, save it to disk and embed it."""
+    # Use the page the workflow thread rendered, else generate (cached across
+    # reruns); save the HTML preview only when it changed
+    preview = (st.session_state.results or {}).get("preview")
+    html_content, preview_hash = preview or _render_preview_html(
+        product_data, faq_data, comparison_data
+    )
+    _write_preview(preview_hash, html_content, PREVIEW_PATH)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Download Preview HTML",
+            html_content,
+            "ecommerce_preview.html",
+            "text/html",
+            use_container_width=True
+        )
+    with col2:
+        st.info(f"Preview saved to: `output/preview.html`\n\nOpen in browser to view.")
+    
+    # Show preview in iframe
+    st.components.v1.html(_minified_preview(preview_hash, html_content), height=800, scrolling=True)
+
+
+def _output_json_tab(title: str, label: str, data: Dict[str, Any], filename: str):
+    """Render one output tab; the JSON tree is only sent when its toggle is on.
+
+    The download is serialized from the same document the tab shows, not
+    read back from disk where another session's run may have replaced it.
+    """
+    st.subheader(title)
+    if st.toggle("Show JSON", key=f"{label.lower()}_json_toggle"):
+        st.json(data)
+    st.download_button(
+        f"📥 Download {label} JSON",
+        _json_dump_bytes(data),
+        filename,
+        "application/json"
+    )
+
+
+@st.fragment
+def preview_panel(
+    product_data: Dict[str, Any],
+    faq_data: Dict[str, Any],
+    comparison_data: Dict[str, Any]
+):
+    """Ecommerce preview section.
+
+    A fragment, so toggling it or downloading the page reruns only this
+    section. While hidden, the page is neither rendered, written nor sent.
+    """
+    st.markdown("### 🌐 Ecommerce Preview")
+    show_preview = st.toggle("🖥️ Show ecommerce preview", value=True, key="preview_expanded")
+    if show_preview:
+        _show_preview(product_data, faq_data, comparison_data)
+
+
+@st.fragment
+def output_tabs_panel(
+    faq_data: Dict[str, Any],
+    product_data: Dict[str, Any],
+    comparison_data: Dict[str, Any]
+):
+    """Raw JSON tabs; a fragment, so their toggles and downloads rerun only this section."""
+    # Create tabs for each output
+    tab1, tab2, tab3 = st.tabs(["📋 FAQ JSON", "📦 Product JSON", "⚖️ Comparison JSON"])
+    faq_name, product_name, comparison_name = OUTPUT_JSON_NAMES
+    
+    with tab1:
+        if faq_data:
+            _output_json_tab("FAQ Data", "FAQ", faq_data, faq_name)
+    
+    with tab2:
+        if product_data:
+            _output_json_tab("Product Page Data", "Product", product_data, product_name)
+    
+    with tab3:
+        if comparison_data:
+            _output_json_tab("Comparison Data", "Comparison", comparison_data, comparison_name)
+
+
 def display_results():
     """Display generated content in tabs."""
     if not st.session_state.results:
@@ -235,38 +519,28 @@ def display_results():
         st.warning("No output files generated. Check errors below.")
         return
     
-    output_dir = os.path.join(os.path.dirname(__file__), "output")
-    
-    # Load all data
-    faq_data = {}
-    product_data = {}
-    comparison_data = {}
-    
-    faq_path = os.path.join(output_dir, "faq.json")
-    if os.path.exists(faq_path):
-        with open(faq_path, 'r') as f:
-            faq_data = json.load(f)
-    
-    product_path = os.path.join(output_dir, "product_page.json")
-    if os.path.exists(product_path):
-        with open(product_path, 'r') as f:
-            product_data = json.load(f)
-    
-    comparison_path = os.path.join(output_dir, "comparison_page.json")
-    if os.path.exists(comparison_path):
-        with open(comparison_path, 'r') as f:
-            comparison_data = json.load(f)
+    # Use the documents handed back by the workflow; fall back to the files
+    # on disk (missing files come back as empty dicts)
+    documents = results.get("output_documents")
+    if documents is not None:
+        faq_data, product_data, comparison_data = (
+            documents.get(name, {}) for name in OUTPUT_JSON_NAMES
+        )
+    else:
+        faq_data, product_data, comparison_data = _load_output_files(
+            OUTPUT_JSON_PATHS, _output_mtimes()
+        )
     
     # Basic Metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Questions", len(results.get("questions", [])))
+        st.metric("Questions", len(results.get("questions") or ()))
     with col2:
-        st.metric("FAQ Items", len(faq_data.get("questions", [])))
+        st.metric("FAQ Items", len(faq_data.get("questions") or ()))
     with col3:
         st.metric("Output Files", len(output_files))
     with col4:
-        st.metric("Errors", len(results.get("errors", [])))
+        st.metric("Errors", len(results.get("errors") or ()))
     
     # Observability Metrics (if available)
     workflow_metrics = results.get("metrics", {})
@@ -284,122 +558,21 @@ def display_results():
     
     st.markdown("---")
     
-    # Preview Button
-    st.markdown("### 🌐 Ecommerce Preview")
-    
-    # Generate and save HTML preview using HtmlGenerator directly
-    generator = HtmlGenerator()
-    html_content = generator.generate(product_data, faq_data, comparison_data)
-    preview_path = os.path.join(output_dir, "preview.html")
-    with open(preview_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.download_button(
-            "📥 Download Preview HTML",
-            html_content,
-            "ecommerce_preview.html",
-            "text/html",
-            use_container_width=True
-        )
-    with col2:
-        st.info(f"Preview saved to: `output/preview.html`\n\nOpen in browser to view.")
-    
-    # Show preview in iframe
-    with st.expander("🖥️ Preview Ecommerce Page", expanded=True):
-        st.components.v1.html(html_content, height=800, scrolling=True)
+    preview_panel(product_data, faq_data, comparison_data)
     
     st.markdown("---")
     
-    # Create tabs for each output
-    tab1, tab2, tab3 = st.tabs(["📋 FAQ JSON", "📦 Product JSON", "⚖️ Comparison JSON"])
-    
-    with tab1:
-        if faq_data:
-            st.subheader("FAQ Data")
-            st.json(faq_data)
-            st.download_button(
-                "📥 Download FAQ JSON",
-                json.dumps(faq_data, indent=2),
-                "faq.json",
-                "application/json"
-            )
-    
-    with tab2:
-        if product_data:
-            st.subheader("Product Page Data")
-            st.json(product_data)
-            st.download_button(
-                "📥 Download Product JSON",
-                json.dumps(product_data, indent=2),
-                "product_page.json",
-                "application/json"
-            )
-    
-    with tab3:
-        if comparison_data:
-            st.subheader("Comparison Data")
-            st.json(comparison_data)
-            st.download_button(
-                "📥 Download Comparison JSON",
-                json.dumps(comparison_data, indent=2),
-                "comparison_page.json",
-                "application/json"
-            )
+    output_tabs_panel(faq_data, product_data, comparison_data)
 
 
-def main():
-    """Main application entry point."""
-    init_session_state()
-    
-    # Header
-    st.markdown('<p class="main-header">🚀 Multi-Agent Content Generator</p>', 
-                unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Multi-Agent AI-Powered Content Generation</p>', 
-                unsafe_allow_html=True)
-    st.markdown("---")
-    
-    # Sidebar
-    with st.sidebar:
-        st.markdown("### ⚙️ System Info")
-        st.markdown("**6 Agents** • **5+ Logic Blocks** • **3 Outputs**")
-        
-        st.markdown("---")
-        
-        # LLM Provider Display (Groq-only)
-        st.markdown("### 🤖 LLM Provider")
-        from config import get_available_providers, get_current_provider, get_current_model
-        
-        available = get_available_providers()
-        if not available:
-            st.error("GROQ_API_KEY not configured. Add to .env")
-        else:
-            st.success("🟢 Groq (Fictional Competitor)")
-            st.caption(f"Model: `{get_current_model()}`")
-            st.caption("Generates fictional but realistic competitor")
-        
-        st.markdown("---")
-        st.markdown("### 📊 Status")
-        if st.session_state.workflow_running:
-            st.warning("🔄 Workflow running...")
-        elif st.session_state.results:
-            st.success("✅ Results ready")
-        else:
-            st.info("Ready to generate")
-        
-        st.markdown("---")
-        # Logs section is handled dynamically via log_placeholder during workflow
-        st.markdown("### 📝 Logs")
-        if not st.session_state.workflow_running and st.session_state.logs:
-            for log in st.session_state.logs[-6:]:
-                st.caption(log[:55] + "..." if len(log) > 55 else log)
-        elif not st.session_state.logs:
-            st.caption("No logs yet. Generate content to see logs.")
-    
-    # Main content
-    st.markdown("### 📝 Product Input")
-    
+@st.fragment
+def product_input_panel():
+    """Product input editor.
+
+    Runs as a fragment so editing fields only reruns this panel and does not
+    re-send the results section (notably the preview iframe) to the browser.
+    Generating calls ``st.rerun()``, which reruns the full app.
+    """
     # Input method selection
     input_method = st.radio(
         "Input Format:",
@@ -408,7 +581,7 @@ def main():
     )
     
     if input_method == "JSON Editor":
-        default_json = json.dumps(EXAMPLE_PRODUCT_DATA, indent=2)
+        default_json = _default_product_json()
         product_json = st.text_area(
             "Product JSON",
             value=default_json,
@@ -437,95 +610,124 @@ def main():
     
     else:  # Text Fields - Dynamic Key-Value Pairs
         st.markdown("#### Enter Product Details")
-        st.caption("Edit keys and values below. Add more fields if needed (minimum 6 required).")
+        st.caption("Edit keys and values below. Add or delete rows from the table toolbar (minimum 6 required).")
         
         # Initialize session state for key-value pairs if not exists
-        if "kv_pairs" not in st.session_state:
-            st.session_state.kv_pairs = [
-                ("name", "GlowBoost Vitamin C Serum"),
-                ("product_type", "10% Vitamin C"),
-                ("target_users", "Oily, Combination"),
-                ("key_features", "Vitamin C, Hyaluronic Acid"),
-                ("benefits", "Brightening, Fades dark spots"),
-                ("how_to_use", "Apply 2–3 drops in the morning before sunscreen"),
-                ("considerations", "Mild tingling for sensitive skin"),
-                ("price", "₹699"),
-            ]
+        st.session_state.setdefault("kv_pairs", [
+            ("name", "GlowBoost Vitamin C Serum"),
+            ("product_type", "10% Vitamin C"),
+            ("target_users", "Oily, Combination"),
+            ("key_features", "Vitamin C, Hyaluronic Acid"),
+            ("benefits", "Brightening, Fades dark spots"),
+            ("how_to_use", "Apply 2–3 drops in the morning before sunscreen"),
+            ("considerations", "Mild tingling for sensitive skin"),
+            ("price", "₹699"),
+        ])
         
-        # Display current key-value pairs
+        # Edits are batched by the form and only sent when Generate is pressed.
+        # The editor keeps its own edits relative to kv_pairs, so kv_pairs
+        # stays the base data.
         st.markdown("##### Product Fields")
+        with st.form("product_form", border=False):
+            edited = st.data_editor(
+                pd.DataFrame(st.session_state.kv_pairs, columns=["key", "value"]),
+                key="kv_editor",
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "key": st.column_config.TextColumn("Key", help="e.g., name, price, benefits"),
+                    "value": st.column_config.TextColumn("Value", width="large"),
+                },
+            )
+            submitted = st.form_submit_button(
+                "🚀 Generate Content", type="primary",
+                disabled=st.session_state.workflow_running,
+                use_container_width=True
+            )
         
-        pairs_to_remove = []
-        updated_pairs = []
-        
-        for i, (key, value) in enumerate(st.session_state.kv_pairs):
-            col1, col2, col3 = st.columns([2, 4, 1])
-            with col1:
-                new_key = st.text_input(
-                    f"Key {i+1}",
-                    value=key,
-                    placeholder="e.g., name, price, benefits",
-                    label_visibility="collapsed",
-                    key=f"key_{i}"
-                )
-            with col2:
-                new_value = st.text_input(
-                    f"Value {i+1}",
-                    value=value,
-                    placeholder="Enter value...",
-                    label_visibility="collapsed",
-                    key=f"value_{i}"
-                )
-            with col3:
-                if len(st.session_state.kv_pairs) > 6:  # Allow removal only if more than 6
-                    if st.button("🗑️", key=f"remove_{i}", help="Remove this field"):
-                        pairs_to_remove.append(i)
-                else:
-                    st.write("")  # Empty space
-            
-            updated_pairs.append((new_key, new_value))
-        
-        # Update session state with edited pairs
-        st.session_state.kv_pairs = [p for i, p in enumerate(updated_pairs) if i not in pairs_to_remove]
-        
-        # Add new field button
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            if st.button("➕ Add Field", use_container_width=True):
-                st.session_state.kv_pairs.append(("new_field", ""))
-                st.rerun()
-        with col2:
-            st.caption(f"Current: {len(st.session_state.kv_pairs)} fields (minimum 6)")
-        
-        st.markdown("---")
-        
-        # Generate button
-        if st.button("🚀 Generate Content", type="primary", 
-                    disabled=st.session_state.workflow_running,
-                    use_container_width=True):
+        if submitted:
             # Build product data from key-value pairs
             product_data = {}
-            list_fields = ["target_users", "key_features", "benefits"]
             
-            for key, value in st.session_state.kv_pairs:
+            for key, value in edited.itertuples(index=False, name=None):
+                key, value = key or "", value or ""
                 if key.strip():
-                    if key in list_fields:
+                    if key in LIST_FIELDS:
                         product_data[key] = [v.strip() for v in value.split(",")]
                     else:
                         product_data[key] = value
             
             # Check minimum required fields
-            required = ["name", "product_type", "target_users", "key_features", 
-                       "benefits", "how_to_use", "considerations", "price"]
-            missing = [f for f in required if f not in product_data]
+            missing = sorted(REQUIRED_FIELDS - product_data.keys())
             
             if missing:
                 st.error(f"❌ Missing required fields: {', '.join(missing)}")
             else:
                 run_generation(product_data)
+
+
+def main():
+    """Main application entry point."""
+    init_session_state()
+    
+    # Header
+    st.markdown('<p class="main-header">🚀 Multi-Agent Content Generator</p>', 
+                unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Multi-Agent AI-Powered Content Generation</p>', 
+                unsafe_allow_html=True)
+    st.markdown("---")
+    
+    # Sidebar
+    with st.sidebar:
+        st.markdown("### ⚙️ System Info")
+        st.markdown("**6 Agents** • **5+ Logic Blocks** • **3 Outputs**")
+        
+        st.markdown("---")
+        
+        # LLM Provider Display (Groq-only)
+        st.markdown("### 🤖 LLM Provider")
+        from config import get_available_providers, get_current_provider, get_current_model
+        
+        available = get_available_providers()
+        if not available:
+            st.error("GROQ_API_KEY not configured. Add to .env")
+        else:
+            st.success("🟢 Groq (Fictional Competitor)")
+            st.caption(f"Model: `{get_current_model()}`")
+            st.caption("Generates fictional but realistic competitor")
+        
+        st.markdown("---")
+        st.markdown("### 📊 Status")
+        if st.session_state.workflow_running:
+            st.warning("🔄 Workflow running...")
+        elif st.session_state.results:
+            st.success("✅ Results ready")
+        else:
+            st.info("Ready to generate")
+        
+        st.markdown("---")
+        # While a workflow runs, workflow_progress_panel shows live logs instead
+        st.markdown("### 📝 Logs")
+        if not st.session_state.workflow_running and st.session_state.logs:
+            _render_log_tail(_log_tail(st.session_state.logs))
+        elif not st.session_state.logs:
+            st.caption("No logs yet. Generate content to see logs.")
+    
+    # Main content
+    st.markdown("### 📝 Product Input")
+    product_input_panel()
     
     st.markdown("---")
     
+    # Live progress while a background workflow is running
+    if st.session_state.workflow_future is not None:
+        workflow_progress_panel()
+    
+    workflow_error = st.session_state.pop("workflow_error", None)
+    if workflow_error:
+        st.error(workflow_error)
+    
     # Results section
     if st.session_state.results:
         st.markdown("### 📄 Generated Content")
@@ -541,7 +743,7 @@ def main():
         # Clear button
         if st.button("🗑️ Clear Results", use_container_width=True):
             st.session_state.results = None
-            st.session_state.logs = []
+            st.session_state.logs = deque(maxlen=MAX_LOG_LINES)
 
 
 if __name__ == "__main__":
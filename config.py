@@ -4,12 +4,24 @@ Configuration for Multi-Agent Content Generation System.
 Groq-Only LLM Provider (llama-3.3-70b-versatile).
 """
 
+import contextlib
+import functools
+import hashlib
+import itertools
 import os
 import logging
+import random
+import re
+import threading
 import time
-from typing import List, Dict, Any
+from collections import OrderedDict, deque
+from typing import (
+    Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+)
 from dotenv import load_dotenv
 
+T = TypeVar("T")
+
 # Load environment variables
 load_dotenv()
 
@@ -22,15 +34,16 @@ class SecretFilter(logging.Filter):
     """Filter to prevent accidental logging of sensitive information."""
     
     SENSITIVE_PATTERNS = ["api_key", "apikey", "secret", "password", "token", "groq_api"]
+    # One case-insensitive scan per record instead of a lowered copy plus a
+    # substring check per pattern
+    _SENSITIVE_RE = re.compile("|".join(map(re.escape, SENSITIVE_PATTERNS)), re.IGNORECASE)
     
     def filter(self, record: logging.LogRecord) -> bool:
         """Redact sensitive information from log messages."""
-        message = str(record.msg).lower()
-        for pattern in self.SENSITIVE_PATTERNS:
-            if pattern in message:
-                # Don't block the log, but warn about potential leak
-                record.msg = f"[REDACTED - potential secret in log] {record.msg[:50]}..."
-                break
+        message = str(record.msg)
+        if self._SENSITIVE_RE.search(message):
+            # Don't block the log, but warn about potential leak
+            record.msg = f"[REDACTED - potential secret in log] {message[:50]}..."
         return True
 
 
@@ -41,12 +54,31 @@ for handler in logging.root.handlers:
 logger = logging.getLogger(__name__)
 
 
+# Resolved secrets by name; only configured secrets are cached
+_secret_cache: Dict[str, str] = {}
+
+
 def get_secret(key: str, default: str = "") -> str:
     """Get secret from Streamlit secrets or environment variable.
     
     This function checks st.secrets first (for Streamlit Cloud),
     then falls back to environment variables (for local development).
+    Found values are cached per key, since this runs on every LLM call;
+    use clear_secret_cache() after changing a secret at runtime. Missing
+    secrets are looked up again each time, so a key added later (e.g. in
+    Streamlit Cloud settings) is picked up without a restart.
     """
+    value = _secret_cache.get(key)
+    if value is None:
+        value = _lookup_secret(key)
+        if value is None:
+            return default
+        _secret_cache[key] = value
+    return value
+
+
+def _lookup_secret(key: str) -> Optional[str]:
+    """Uncached secret lookup: st.secrets, then the environment."""
     # Try Streamlit secrets first (for Streamlit Cloud deployment)
     try:
         import streamlit as st
@@ -55,17 +87,36 @@ def get_secret(key: str, default: str = "") -> str:
     except Exception:
         pass
     # Fall back to environment variable
-    return os.getenv(key, default)
+    return os.environ.get(key)
+
+
+def clear_secret_cache() -> None:
+    """Forget cached secrets so the next lookup re-reads them."""
+    _secret_cache.clear()
 
 
 # ============ Groq Configuration (Only LLM Provider) ============
-GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+GROQ_API_KEY: str = os.environ.get("GROQ_API_KEY", "")
 GROQ_MODEL: str = "llama-3.3-70b-versatile"
 
 # ============ Common Parameters ============
 DEFAULT_TEMPERATURE: float = 0.7
 MAX_OUTPUT_TOKENS: int = 2048
 
+# ============ Observability ============
+# Set to any non-empty value to keep full prompt text in agent metrics
+STORE_PROMPTS_ENV: str = "KASPARRO_STORE_PROMPTS"
+
+
+def should_store_prompts(agent_logger: logging.Logger) -> bool:
+    """
+    Check whether full prompt text should be kept in agent metrics.
+    
+    Prompts are multi-KB strings, so they are only retained when the
+    agent's logger has DEBUG enabled or KASPARRO_STORE_PROMPTS is set.
+    """
+    return agent_logger.isEnabledFor(logging.DEBUG) or bool(os.environ.get(STORE_PROMPTS_ENV))
+
 
 def get_llm():
     """
@@ -77,36 +128,245 @@ def get_llm():
 
 def _get_groq_llm():
     """Get Groq LLM instance."""
-    from langchain_groq import ChatGroq
+    # Rotated, validated key; clients are cached per key so each keeps its
+    # own warm connection pool instead of re-handshaking on every call
+    return _get_cached_client(_get_next_key())
+
+
+# Errors worth retrying on another key: HTTP 429, quota and rate-limit messages
+_RATE_LIMIT_RE = re.compile(r"429|quota|rate[-_ ]?limit", re.IGNORECASE)
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    """Read an integer setting from the environment, falling back on bad values."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r, using %d", name, raw, default)
+        return default
+    return max(minimum, value)
+
+
+def _env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """Read a float setting from the environment, falling back on bad values."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning("Ignoring non-numeric %s=%r, using %s", name, raw, default)
+        return default
+    return max(minimum, value)
+
+
+# Seconds the question generator waits for the LLM before serving template
+# questions instead; 0 (the default) waits for the LLM
+QUESTION_SOFT_DEADLINE_S: float = _env_float("QUESTION_SOFT_DEADLINE_S", 0.0)
+
+# Optional per-key budgets enforced before sending; 0 (the default) disables
+# them. For the Groq free tier on the default model use 30 RPM / 12000 TPM.
+GROQ_RPM_LIMIT: int = _env_int("GROQ_RPM_LIMIT", 0)
+GROQ_TPM_LIMIT: int = _env_int("GROQ_TPM_LIMIT", 0)
+RATE_WINDOW_S: float = 60.0
+_rate_limiters: Dict[str, "_SlidingWindow"] = {}
+
+# Average UTF-8 bytes per token for the fallback estimate (BPE tokenizers
+# average close to 4 for English; lower for non-ASCII-heavy text)
+BYTES_PER_TOKEN: float = 3.6
+
+# Cap on a provider-requested retry delay
+MAX_RETRY_AFTER_S: float = 30.0
+# Groq reset headers look like "7.66s", "2m59.56s" or "120ms"
+_RESET_DURATION_RE = re.compile(
+    r"^(?:(?P<h>\d+(?:\.\d+)?)h)?(?:(?P<m>\d+(?:\.\d+)?)m(?!s))?"
+    r"(?:(?P<s>\d+(?:\.\d+)?)s)?(?:(?P<ms>\d+(?:\.\d+)?)ms)?$"
+)
+
+class _State:
+    """Mutable module state, kept on one object instead of rebinding globals."""
     
-    # Get API key dynamically (supports both .env and st.secrets)
-    api_key = get_secret("GROQ_API_KEY", "")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not set. Add to .env file or Streamlit secrets.")
+    __slots__ = ("keys_cache", "key_cycle", "key_cycle_src", "local_tokenizer_available")
     
-    return ChatGroq(
-        model=GROQ_MODEL,
-        groq_api_key=api_key,
-        temperature=DEFAULT_TEMPERATURE,
-        max_tokens=MAX_OUTPUT_TOKENS
-    )
+    def __init__(self):
+        # (raw secret, parsed keys)
+        self.keys_cache: Optional[Tuple[str, Tuple[str, ...]]] = None
+        self.key_cycle: Optional[Iterator[str]] = None
+        # Keys the rotation was built from
+        self.key_cycle_src: Tuple[str, ...] = ()
+        # Cleared after get_num_tokens fails once (usually no local tokenizer)
+        self.local_tokenizer_available = True
+
+
+_state = _State()
+
+# Track key rotation and client cache
+_key_lock = threading.Lock()
+MAX_CACHED_CLIENTS: int = 8  # Bound on cached per-key LLM clients
+
+# Exact-prompt response memo used by invoke_memoized
+PROMPT_MEMO_SIZE: int = 128
+PROMPT_MEMO_TTL_S: float = 3600.0
+_memo_lock = threading.Lock()
+_prompt_memo: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+
+# Adaptive window defaults. The window starts at 4 rather than 2 because one
+# workflow issues up to ~6 independent block calls at once. The latency target
+# is 15s rather than 3s because a 70B model writing a multi-KB JSON answer
+# routinely takes 5-10s; a 3s target would count every normal call as slow
+# and collapse the window to 1.
+AIMD_INITIAL_CONCURRENCY: float = _env_float("AIMD_INITIAL_CONCURRENCY", 4.0, minimum=1.0)
+AIMD_TARGET_LATENCY_S: float = _env_float("AIMD_TARGET_LATENCY_S", 15.0)
+# Longest a call waits for a window slot before going ahead anyway, so a
+# leaked slot degrades to one extra in-flight call instead of a deadlock
+AIMD_ACQUIRE_TIMEOUT_S: float = _env_float("AIMD_ACQUIRE_TIMEOUT_S", 120.0)
+
+
+class _AIMDController:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight LLM calls.
+    
+    Shared by callers across threads. Each call that finishes within
+    ``target_latency_s`` widens the window by ``alpha``; a rate-limit error
+    or a slow response shrinks it by ``beta``, at most once per window: a
+    call only cuts if no cut happened since it started, so a burst of 429s
+    from calls already in flight halves the window once rather than once
+    per call. Other errors leave it unchanged. The window settles just
+    under the provider's real ceiling instead of a fixed guess. Defaults
+    come from the AIMD_* settings.
+    """
+    
+    def __init__(
+        self,
+        c_min: int = 1,
+        c_max: int = 16,
+        initial: Optional[float] = None,
+        target_latency_s: Optional[float] = None,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        acquire_timeout_s: Optional[float] = None
+    ):
+        self.c_min = c_min
+        self.c_max = c_max
+        self.limit = float(AIMD_INITIAL_CONCURRENCY if initial is None else initial)
+        self.target_latency_s = (
+            AIMD_TARGET_LATENCY_S if target_latency_s is None else target_latency_s
+        )
+        self.alpha = alpha
+        self.beta = beta
+        self.acquire_timeout_s = (
+            AIMD_ACQUIRE_TIMEOUT_S if acquire_timeout_s is None else acquire_timeout_s
+        )
+        self.in_flight = 0
+        self.generation = 0  # Bumped on every cut
+        self._cond = threading.Condition()
+    
+    def try_acquire(self) -> bool:
+        """Take a slot if the window has room."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+    
+    def acquire(self) -> int:
+        """
+        Block until a slot is free (at most ``acquire_timeout_s``), then take it.
+        
+        Returns the window generation to pass back to release.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self.in_flight < int(self.limit), timeout=self.acquire_timeout_s
+            ):
+                self._log_overcommit()
+            self.in_flight += 1
+            return self.generation
+    
+    def _log_overcommit(self) -> None:
+        logger.warning(
+            "No LLM slot freed within %.0fs (%d in flight, window %d); proceeding anyway",
+            self.acquire_timeout_s, self.in_flight, int(self.limit)
+        )
+    
+    def release(
+        self,
+        latency_s: Optional[float],
+        throttled: bool = False,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Free a slot and adjust the window; ``latency_s`` is None for failed calls.
+        
+        ``generation`` is the value acquire returned. A decrease is skipped
+        if the window was already cut after that call started.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if throttled or (latency_s is not None and latency_s > self.target_latency_s):
+                if generation is None or generation == self.generation:
+                    self.limit = max(float(self.c_min), self.limit * self.beta)
+                    self.generation += 1
+            elif latency_s is not None:
+                self.limit = min(float(self.c_max), self.limit + self.alpha)
+            self._cond.notify_all()
+    
+    def _finish(self, start: float, generation: int, exc: Optional[BaseException]) -> None:
+        if exc is None:
+            self.release(time.monotonic() - start, generation=generation)
+        else:
+            # Interrupts free the slot without a signal
+            throttled = isinstance(exc, Exception) and bool(_RATE_LIMIT_RE.search(str(exc)))
+            self.release(None, throttled=throttled, generation=generation)
+    
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot around one blocking LLM call."""
+        generation = self.acquire()
+        start = time.monotonic()
+        failure: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            failure = e
+            raise
+        finally:
+            self._finish(start, generation, failure)
+
 
+_AIMD = _AIMDController()
 
-# Track key rotation index and client cache
-_key_index = 0
-_client_cache: Dict[str, Any] = {}  # Per-key client cache
+
+def _get_api_keys() -> Tuple[str, ...]:
+    """
+    Get the validated API keys for rotation.
+    
+    The parsed keys are cached against the raw GROQ_API_KEY string, so
+    splitting and validation (and its warnings) only rerun when the secret
+    changes, e.g. after clear_secret_cache().
+    """
+    key_string = get_secret("GROQ_API_KEY", "")
+    cached = _state.keys_cache
+    if cached is not None and cached[0] == key_string:
+        return cached[1]
+    
+    keys = _parse_api_keys(key_string)
+    _state.keys_cache = (key_string, keys)
+    return keys
 
 
-def _get_api_keys() -> List[str]:
+def _parse_api_keys(key_string: str) -> Tuple[str, ...]:
     """
-    Get list of API keys with validation.
+    Parse a GROQ_API_KEY value into a tuple of keys.
     
     Supports comma-separated multiple keys for rotation.
     Validates key length and logs warnings without exposing key values.
     """
-    key_string = get_secret("GROQ_API_KEY", "")
     if not key_string:
-        return []
+        return ()
     
     raw_keys = [k.strip() for k in key_string.split(",")]
     keys: List[str] = []
@@ -125,32 +385,213 @@ def _get_api_keys() -> List[str]:
     if not keys:
         logger.warning("No valid GROQ_API_KEY entries found after validation")
     
-    return keys
+    return tuple(keys)
 
 
 def _get_next_key() -> str:
-    """Get next API key using rotation for load balancing."""
-    global _key_index
+    """Get next API key using rotation for load balancing.
+    
+    Agents call this from several worker threads at once, so the rotation
+    iterator is advanced (and rebuilt when the keys change) under a lock.
+    """
     keys = _get_api_keys()
     if not keys:
         raise ValueError("GROQ_API_KEY not set. Add to .env file or Streamlit secrets.")
-    key = keys[_key_index % len(keys)]
-    _key_index += 1
-    return key
+    with _key_lock:
+        if _state.key_cycle is None or keys != _state.key_cycle_src:
+            _state.key_cycle = itertools.cycle(keys)
+            _state.key_cycle_src = keys
+        return next(_state.key_cycle)
 
 
 def _get_cached_client(api_key: str) -> Any:
     """Get or create cached ChatGroq client for the given API key."""
+    return _build_client(api_key, GROQ_MODEL, DEFAULT_TEMPERATURE, MAX_OUTPUT_TOKENS)
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_CLIENTS)
+def _build_client(api_key: str, model: str, temperature: float, max_tokens: int) -> Any:
+    """
+    Build a ChatGroq client, cached per key and client settings.
+    
+    The LRU bound keeps rotated-out keys (e.g. after a secret reload) from
+    accumulating clients and their connection pools.
+    """
+    # Imported only when a client is built: langchain_groq is slow to load
+    # and not needed to render the app
     from langchain_groq import ChatGroq
     
-    if api_key not in _client_cache:
-        _client_cache[api_key] = ChatGroq(
-            model=GROQ_MODEL,
-            groq_api_key=api_key,
-            temperature=DEFAULT_TEMPERATURE,
-            max_tokens=MAX_OUTPUT_TOKENS
+    return ChatGroq(
+        model=model,
+        groq_api_key=api_key,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        http_client=_get_shared_http_client()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_shared_http_client() -> Any:
+    """
+    Get the sync HTTP client shared by every cached ChatGroq instance.
+    
+    One connection pool serves all keys, so rotating keys reuses warm
+    connections instead of handshaking once per key. The async side keeps
+    each client's own pool: an httpx.AsyncClient is tied to the event loop
+    it first ran on, and every workflow run gets a new loop.
+    """
+    import atexit
+    import httpx
+    
+    client = httpx.Client(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+    atexit.register(client.close)
+    return client
+
+
+class _SlidingWindow:
+    """
+    Request and token budget for one API key over a trailing window.
+    
+    Requests are admitted only while both budgets have room, so calls that
+    would certainly be rejected with a 429 wait locally instead of spending
+    a round-trip. A limit of 0 disables that budget.
+    """
+    
+    def __init__(self, rpm: int, tpm: int, window_s: float = RATE_WINDOW_S):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_s = window_s
+        self._requests: Deque[Tuple[float, int]] = deque()  # (admitted at, tokens)
+        self._tokens = 0
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens: int, now: Optional[float] = None) -> float:
+        """Admit a request and return 0.0, or return seconds until there may be room."""
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            cutoff = now - self.window_s
+            while self._requests and self._requests[0][0] <= cutoff:
+                self._tokens -= self._requests.popleft()[1]
+            
+            over_rpm = self.rpm and len(self._requests) >= self.rpm
+            # An empty window always admits, even a request larger than tpm
+            over_tpm = self.tpm and self._requests and self._tokens + tokens > self.tpm
+            if over_rpm or over_tpm:
+                return self._requests[0][0] + self.window_s - now
+            
+            self._requests.append((now, tokens))
+            self._tokens += tokens
+            return 0.0
+    
+    def wait_if_throttled(self, tokens: int) -> None:
+        """Block until the request fits in the window."""
+        delay = self.reserve(tokens)
+        while delay > 0:
+            logger.info("Rate window full, waiting %.1fs before sending", delay)
+            time.sleep(delay)
+            delay = self.reserve(tokens)
+
+
+def _budget_tokens(prompt: str, encoded: Optional[bytes] = None) -> int:
+    """
+    Tokens to reserve in the TPM window for one request.
+    
+    Providers count completion tokens against TPM too, so the prompt
+    estimate is topped up with the most the response can use.
+    """
+    return _estimate_tokens(prompt, encoded) + MAX_OUTPUT_TOKENS
+
+
+def _get_rate_limiter(api_key: str) -> _SlidingWindow:
+    """Get the sliding-window limiter for an API key."""
+    limiter = _rate_limiters.get(api_key)
+    if limiter is None:
+        limiter = _rate_limiters.setdefault(
+            api_key, _SlidingWindow(GROQ_RPM_LIMIT, GROQ_TPM_LIMIT)
         )
-    return _client_cache[api_key]
+    return limiter
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """
+    Read the provider's requested retry delay off a rate-limit exception.
+    
+    Checks ``Retry-After`` (seconds), then Groq's ``x-ratelimit-reset-*``
+    durations. Returns None when the exception carries no usable header.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form; fall through to the reset headers
+    
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        match = _RESET_DURATION_RE.match(headers.get(name) or "")
+        if match and any(match.groupdict().values()):
+            parts = {k: float(v) for k, v in match.groupdict().items() if v}
+            return (
+                parts.get("h", 0.0) * 3600
+                + parts.get("m", 0.0) * 60
+                + parts.get("s", 0.0)
+                + parts.get("ms", 0.0) / 1000
+            )
+    return None
+
+
+def _compute_backoff(attempt: int, exc: Exception) -> float:
+    """
+    Seconds to wait before retry ``attempt + 1``.
+    
+    Honors the provider's requested delay (capped at MAX_RETRY_AFTER_S) so
+    retries neither oversleep nor hit another 429; otherwise falls back to
+    exponential backoff with jitter.
+    """
+    retry_after = _retry_after_seconds(exc)
+    if retry_after is not None:
+        return min(max(retry_after, 0.0), MAX_RETRY_AFTER_S)
+    return (2 ** attempt) + random.uniform(0, 1)
+
+
+def _log_retry(attempt: int, max_attempts: int, exc: Exception) -> float:
+    """Pick the delay before the next attempt and log it."""
+    # Provider-requested delay, else exponential backoff with jitter
+    wait_time = _compute_backoff(attempt, exc)
+    logger.warning(
+        "Rate limit hit, rotating key and retrying in %.1fs (attempt %d/%d)",
+        wait_time,
+        attempt + 1,
+        max_attempts
+    )
+    return wait_time
+
+
+def _retry(call: Callable[[str], T], max_attempts: int) -> T:
+    """
+    Run ``call(api_key)`` with key rotation, retrying rate-limit errors.
+    
+    Each attempt gets the next API key. Rate-limit failures back off via
+    _compute_backoff and retry; any other error is re-raised unchanged.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return call(_get_next_key())
+        except Exception as e:
+            if not _RATE_LIMIT_RE.search(str(e)):
+                # Do not log full exception details; just re-raise
+                raise
+            time.sleep(_log_retry(attempt, max_attempts, e))
+    
+    # Sanitized error message without exposing provider details
+    raise Exception("All attempts exhausted after key rotation.")
 
 
 def invoke_with_retry(prompt: str, max_attempts: int = 4) -> str:
@@ -170,37 +611,87 @@ def invoke_with_retry(prompt: str, max_attempts: int = 4) -> str:
     Returns:
         LLM response content as string
     """
-    import random
+    budget_tokens = _budget_tokens(prompt)
     
-    last_error = None
+    def call(api_key: str) -> str:
+        llm = _get_cached_client(api_key)  # Reuse cached client
+        _get_rate_limiter(api_key).wait_if_throttled(budget_tokens)
+        with _AIMD.slot():
+            return llm.invoke(prompt).content
     
-    for attempt in range(max_attempts):
-        try:
-            api_key = _get_next_key()  # Rotate to next key
-            llm = _get_cached_client(api_key)  # Reuse cached client
-            response = llm.invoke(prompt)
-            return response.content
-        except Exception as e:
-            last_error = e
-            error_str = str(e).lower()
-            
-            if "429" in str(e) or "quota" in error_str or "rate" in error_str:
-                # Exponential backoff with jitter
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
-                logger.warning(
-                    "Rate limit hit, rotating key and retrying in %.1fs (attempt %d/%d)",
-                    wait_time,
-                    attempt + 1,
-                    max_attempts
-                )
-                time.sleep(wait_time)
-                continue
-            else:
-                # Do not log full exception details; just re-raise
-                raise e
+    return _retry(call, max_attempts)
+
+
+def invoke_memoized(
+    prompt: str,
+    max_attempts: int = 4,
+    parse: Optional[Callable[[str], Any]] = None
+) -> Any:
+    """
+    invoke_with_retry with an exact-prompt response memo.
     
-    # Sanitized error message without exposing provider details
-    raise Exception("All attempts exhausted after key rotation.")
+    Responses are keyed by a blake2b digest of the prompt and kept for
+    PROMPT_MEMO_TTL_S in an LRU of PROMPT_MEMO_SIZE entries, so repeating
+    a prompt skips the API round trip. Meant for logic blocks whose output
+    depends only on the prompt; callers that re-ask to get a different
+    answer should use invoke_with_retry.
+    
+    A response is only stored once the call succeeded and, if given,
+    ``parse`` accepted it, so a malformed reply is re-asked next time
+    instead of replaying the same failure for the whole TTL. The raw text
+    is what gets stored; ``parse`` runs again on every hit.
+    
+    Args:
+        prompt: The prompt to send to the LLM
+        max_attempts: Maximum number of retry attempts
+        parse: Optional callable applied to the response text; any
+            exception it raises propagates and nothing is stored
+        
+    Returns:
+        ``parse(response)`` if ``parse`` is given, else the response text
+    """
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+    with _memo_lock:
+        entry = _prompt_memo.get(key)
+        if entry is not None and time.monotonic() - entry[0] < PROMPT_MEMO_TTL_S:
+            _prompt_memo.move_to_end(key)
+            response = entry[1]
+            return parse(response) if parse else response
+    
+    response = invoke_with_retry(prompt, max_attempts)
+    result = parse(response) if parse else response
+    
+    with _memo_lock:
+        _prompt_memo[key] = (time.monotonic(), response)
+        _prompt_memo.move_to_end(key)
+        while len(_prompt_memo) > PROMPT_MEMO_SIZE:
+            _prompt_memo.popitem(last=False)
+    return result
+
+
+def _estimate_tokens(text: str, encoded: Optional[bytes] = None) -> int:
+    """
+    Estimate tokens from UTF-8 length, for when no tokenizer is available.
+    
+    Byte length tracks BPE tokens better than character count for non-ASCII
+    text such as "₹". Pass ``encoded`` when the bytes already exist.
+    """
+    if not text:
+        return 0
+    size = len(encoded) if encoded is not None else len(text.encode("utf-8"))
+    return max(1, int(size / BYTES_PER_TOKEN))
+
+
+def _count_tokens(llm: Any, text: str, encoded: Optional[bytes] = None) -> int:
+    """Count tokens with the client's tokenizer, else estimate from byte length."""
+    if _state.local_tokenizer_available:
+        try:
+            return llm.get_num_tokens(text)
+        except Exception:
+            # Typically a missing tokenizer package; don't retry the import
+            # on every call
+            _state.local_tokenizer_available = False
+    return _estimate_tokens(text, encoded)
 
 
 def invoke_with_metrics(prompt: str, max_attempts: int = 4) -> tuple:
@@ -208,9 +699,10 @@ def invoke_with_metrics(prompt: str, max_attempts: int = 4) -> tuple:
     Invoke LLM with metrics tracking for observability.
     
     Returns both the response content and a metrics dict containing:
-    - prompt_hash: MD5 hash of prompt (first 8 chars)
-    - tokens_in: Input tokens (real count via get_num_tokens or estimate)
-    - tokens_out: Output tokens (real count via get_num_tokens or estimate)
+    - prompt_hash: 8-hex-char blake2b digest of the prompt
+    - tokens_in: Input tokens (provider usage, else get_num_tokens or estimate)
+    - tokens_out: Output tokens (provider usage, else get_num_tokens or estimate)
+    - cached_tokens: Input tokens served from the provider's prompt cache
     - output_len: Length of response in characters
     
     Args:
@@ -220,63 +712,41 @@ def invoke_with_metrics(prompt: str, max_attempts: int = 4) -> tuple:
     Returns:
         Tuple of (response_content: str, metrics: Dict, prompt_text: str)
     """
-    import hashlib
-    import random
-    from langchain_groq import ChatGroq
+    # Compute prompt hash for tracking; the bytes also feed the token budget
+    prompt_bytes = prompt.encode()
+    prompt_hash = hashlib.blake2b(prompt_bytes, digest_size=4).hexdigest()
+    budget_tokens = _budget_tokens(prompt, prompt_bytes)
     
-    # Compute prompt hash for tracking
-    prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:8]
+    def call(api_key: str) -> Tuple[Any, Any]:
+        llm = _get_cached_client(api_key)
+        _get_rate_limiter(api_key).wait_if_throttled(budget_tokens)
+        with _AIMD.slot():
+            return llm.invoke(prompt), llm
     
-    last_error = None
+    response, llm = _retry(call, max_attempts)
+    response_text = response.content
     
-    for attempt in range(max_attempts):
-        try:
-            api_key = _get_next_key()
-            llm = _get_cached_client(api_key)
-            
-            # Try to get real token count using get_num_tokens
-            try:
-                tokens_in = llm.get_num_tokens(prompt)
-            except Exception:
-                tokens_in = len(prompt) // 4  # Fallback estimate
-            
-            response = llm.invoke(prompt)
-            response_text = response.content
-            
-            # Try to get real output token count
-            try:
-                tokens_out = llm.get_num_tokens(response_text)
-            except Exception:
-                tokens_out = len(response_text) // 4  # Fallback estimate
-            
-            # Build metrics
-            metrics = {
-                "prompt_hash": prompt_hash,
-                "tokens_in": tokens_in,
-                "tokens_out": tokens_out,
-                "output_len": len(response_text)
-            }
-            
-            return response_text, metrics, prompt
-            
-        except Exception as e:
-            last_error = e
-            error_str = str(e).lower()
-            
-            if "429" in str(e) or "quota" in error_str or "rate" in error_str:
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
-                logger.warning(
-                    "Rate limit hit, rotating key and retrying in %.1fs (attempt %d/%d)",
-                    wait_time,
-                    attempt + 1,
-                    max_attempts
-                )
-                time.sleep(wait_time)
-                continue
-            else:
-                raise e
+    # Real counts come back with the response; only tokenize locally
+    # when the provider did not report usage
+    usage = getattr(response, "usage_metadata", None) or {}
+    tokens_in = usage.get("input_tokens")
+    if tokens_in is None:
+        tokens_in = _count_tokens(llm, prompt, prompt_bytes)
+    tokens_out = usage.get("output_tokens")
+    if tokens_out is None:
+        tokens_out = _count_tokens(llm, response_text)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
     
-    raise Exception("All attempts exhausted after key rotation.")
+    # Build metrics
+    metrics = {
+        "prompt_hash": prompt_hash,
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "cached_tokens": cached_tokens,
+        "output_len": len(response_text)
+    }
+    
+    return response_text, metrics, prompt
 
 
 def get_available_providers() -> List[str]:
@@ -4,26 +4,31 @@ Fixtures for example product data.
 Separates example data from core models for cleaner code organization.
 """
 
-EXAMPLE_PRODUCT_DATA = {
+from types import MappingProxyType
+from typing import Any, Mapping
+
+# Read-only all the way down (tuples for list fields) so callers can share
+# it without copying
+EXAMPLE_PRODUCT_DATA: Mapping[str, Any] = MappingProxyType({
     "name": "GlowBoost Vitamin C Serum",
     "product_type": "10% Vitamin C Serum",
-    "target_users": ["Oily skin", "Combination skin", "Anti-aging enthusiasts"],
-    "key_features": [
+    "target_users": ("Oily skin", "Combination skin", "Anti-aging enthusiasts"),
+    "key_features": (
         "10% Vitamin C (L-Ascorbic Acid)",
         "Hyaluronic Acid",
         "Niacinamide",
         "Plant extracts"
-    ],
-    "benefits": [
+    ),
+    "benefits": (
         "Brightening",
         "Dark spot fading",
         "Antioxidant protection",
         "Hydration"
-    ],
+    ),
     "how_to_use": "Apply 2-3 drops to face and neck each morning after cleansing and toning. Follow with moisturizer and sunscreen.",
     "considerations": "May cause mild tingling for sensitive skin. Always patch test before first use.",
     "price": "₹699"
-}
+})
 
 
 # Minimal example for testing
@@ -33,6 +38,9 @@ MINIMAL_PRODUCT_DATA = {
 }
 
 
-def get_example_product() -> dict:
-    """Get example product data for UI defaults."""
-    return EXAMPLE_PRODUCT_DATA.copy()
+def get_example_product() -> Mapping[str, Any]:
+    """Get example product data for UI defaults.
+    
+    Returns the shared read-only mapping; use ``dict(...)`` for a mutable copy.
+    """
+    return EXAMPLE_PRODUCT_DATA
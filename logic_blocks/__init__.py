@@ -9,23 +9,49 @@ product data into structured content. Each block is:
 - Composable
 """
 
-from logic_blocks.benefits_block import generate_benefits_block
-from logic_blocks.usage_block import generate_usage_block
-from logic_blocks.ingredients_block import generate_ingredients_block
-from logic_blocks.safety_block import generate_safety_block
-from logic_blocks.comparison_blocks import (
-    compare_ingredients_block,
-    compare_benefits_block,
-    generate_pricing_block
-)
-from logic_blocks.cross_block_analyzer import (
-    analyze_benefit_safety_conflicts,
-    analyze_ingredient_benefit_links,
-    generate_cross_block_summary
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from logic_blocks.benefits_block import (
+        generate_benefits_block,
+        generate_benefits_blocks_bulk
+    )
+    from logic_blocks.usage_block import generate_usage_block
+    from logic_blocks.ingredients_block import generate_ingredients_block
+    from logic_blocks.safety_block import generate_safety_block
+    from logic_blocks.comparison_blocks import (
+        compare_ingredients_block,
+        compare_benefits_block,
+        generate_pricing_block
+    )
+    from logic_blocks.cross_block_analyzer import (
+        analyze_benefit_safety_conflicts,
+        analyze_ingredient_benefit_links,
+        generate_cross_block_summary
+    )
+    from logic_blocks.runner import run_blocks
+
+# Public name -> submodule; submodules are imported on first attribute access
+# (PEP 562) so importing the package only loads the blocks a caller uses
+_SUBMODULES = {
+    "generate_benefits_block": "benefits_block",
+    "generate_benefits_blocks_bulk": "benefits_block",
+    "generate_usage_block": "usage_block",
+    "generate_ingredients_block": "ingredients_block",
+    "generate_safety_block": "safety_block",
+    "compare_ingredients_block": "comparison_blocks",
+    "compare_benefits_block": "comparison_blocks",
+    "generate_pricing_block": "comparison_blocks",
+    "analyze_benefit_safety_conflicts": "cross_block_analyzer",
+    "analyze_ingredient_benefit_links": "cross_block_analyzer",
+    "generate_cross_block_summary": "cross_block_analyzer",
+    "run_blocks": "runner",
+}
 
 __all__ = [
     "generate_benefits_block",
+    "generate_benefits_blocks_bulk",
     "generate_usage_block",
     "generate_ingredients_block",
     "generate_safety_block",
@@ -34,5 +60,20 @@ __all__ = [
     "generate_pricing_block",
     "analyze_benefit_safety_conflicts",
     "analyze_ingredient_benefit_links",
-    "generate_cross_block_summary"
+    "generate_cross_block_summary",
+    "run_blocks"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` and cache the function here."""
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
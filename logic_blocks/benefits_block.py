@@ -10,11 +10,55 @@ import json
 import logging
 
 from models import ProductModel
-from config import invoke_with_retry
+from config import invoke_memoized
 from utils import clean_json_response
 
 logger = logging.getLogger(__name__)
 
+# Static scoring instructions that open every benefits prompt; kept as one
+# constant so the text is byte-identical across calls and the provider can
+# reuse its cached prefix
+_BENEFITS_RUBRIC = """Analyze and score each benefit for every product listed at the end.
+
+For each benefit, provide:
+1. Category: immediate_result, long_term_care, or quality_of_life
+2. Impact Score (0-10): How significant is this benefit?
+   - 9-10: Life-changing, addresses critical needs
+   - 7-8: Highly valuable, clear improvement
+   - 5-6: Moderate value, nice to have
+   - 3-4: Minor improvement
+   - 1-2: Negligible impact
+3. Confidence: high/medium/low (based on how well the benefit is supported by product features)
+4. Evidence Strength: strong/moderate/weak (how verifiable is this benefit?)
+5. User Segments: Who benefits most? (e.g., "busy professionals", "sensitive skin users")
+6. Time to Effect: How long until users see results? (e.g., "immediate", "2-4 weeks")
+7. Sustainability: short-term, long-term, or permanent
+
+Return one entry per product as a JSON array: [{
+  "product_id": 1,
+  "benefits": [{
+    "benefit": "X",
+    "description": "...",
+    "category": "immediate_result|long_term_care|quality_of_life",
+    "impact_score": 8.5,
+    "confidence": "high",
+    "evidence_strength": "strong",
+    "user_segments": ["segment1", "segment2"],
+    "time_to_effect": "2-4 weeks",
+    "sustainability": "long-term"
+  }]
+}]
+Output ONLY valid JSON array."""
+
+
+def _parse_benefits_response(response: str) -> List[Any]:
+    """Parse the bulk benefits reply, which must be a JSON array."""
+    # Clean markdown code blocks using utility function
+    parsed = json.loads(clean_json_response(response.strip()))
+    if not isinstance(parsed, list):
+        raise ValueError("expected a JSON array")
+    return parsed
+
 
 def generate_benefits_block(product: ProductModel) -> Dict[str, Any]:
     """
@@ -28,126 +72,160 @@ def generate_benefits_block(product: ProductModel) -> Dict[str, Any]:
     - Sustainability assessment
     - Aggregate metrics and rankings
     
+    Thin wrapper over generate_benefits_blocks_bulk() with a single product.
+    
     Args:
         product: Validated ProductModel
         
     Returns:
         Dictionary containing structured benefits data with scoring and analysis
     """
+    return generate_benefits_blocks_bulk([product])[0]
+
+
+def generate_benefits_blocks_bulk(products: List[ProductModel]) -> List[Dict[str, Any]]:
+    """
+    Score the benefits of several products in a single LLM round trip.
+    
+    All products are sent as one JSON list so the scoring instructions are
+    paid for once. Each product gets a numeric product_id, and results are
+    matched back by that id (normalized to int, since models sometimes echo
+    it as a string), not by position. A product missing from the response
+    falls back to basic scoring on its own; a failed call falls back for
+    every product.
+    
+    Args:
+        products: Validated ProductModels
+        
+    Returns:
+        One benefits block per product, in the same order as ``products``
+    """
+    if not products:
+        return []
+    
     try:
-        prompt = f"""Analyze and score each benefit for "{product.name}".
+        items = [
+            {
+                "product_id": i,
+                "name": product.name,
+                "type": product.product_type,
+                "benefits": list(product.benefits),
+                "target_users": list(product.target_users)
+            }
+            for i, product in enumerate(products, 1)
+        ]
+        # Static rubric first, product data last, so the shared prefix
+        # is as long as possible
+        prompt = f"""{_BENEFITS_RUBRIC}
 
-Product: {product.name}
-Type: {product.product_type}
-Benefits: {', '.join(product.benefits)}
-Target Users: {', '.join(product.target_users)}
+Now analyze:
+Products (JSON):
+{json.dumps(items, ensure_ascii=False)}"""
 
-For each benefit, provide:
-1. Category: immediate_result, long_term_care, or quality_of_life
-2. Impact Score (0-10): How significant is this benefit?
-   - 9-10: Life-changing, addresses critical needs
-   - 7-8: Highly valuable, clear improvement
-   - 5-6: Moderate value, nice to have
-   - 3-4: Minor improvement
-   - 1-2: Negligible impact
-3. Confidence: high/medium/low (based on how well the benefit is supported by product features)
-4. Evidence Strength: strong/moderate/weak (how verifiable is this benefit?)
-5. User Segments: Who benefits most? (e.g., "busy professionals", "sensitive skin users")
-6. Time to Effect: How long until users see results? (e.g., "immediate", "2-4 weeks")
-7. Sustainability: short-term, long-term, or permanent
+        # Parsing inside the memo keeps malformed replies out of it
+        parsed = invoke_memoized(prompt, parse=_parse_benefits_response)
+    except Exception as e:
+        logger.warning(f"Benefits block LLM failed: {e}")
+        return [_fallback_benefits_block(product) for product in products]
+    
+    # Models sometimes echo ids as strings ("1"); normalize before matching
+    by_id = {}
+    for entry in parsed:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            by_id[int(entry.get("product_id"))] = entry.get("benefits")
+        except (TypeError, ValueError):
+            logger.warning(f"Benefits entry with invalid product_id: {entry.get('product_id')!r}")
+    
+    blocks = []
+    for i, product in enumerate(products, 1):
+        detailed = by_id.get(i)
+        try:
+            if not detailed:
+                raise ValueError("no benefits returned")
+            blocks.append(_build_benefits_block(product, detailed))
+        except Exception as e:
+            logger.warning(f"Benefits block for {product.name} failed: {e}")
+            blocks.append(_fallback_benefits_block(product))
+    return blocks
 
-Return JSON array: [{{
-  "benefit": "X",
-  "description": "...",
-  "category": "immediate_result|long_term_care|quality_of_life",
-  "impact_score": 8.5,
-  "confidence": "high",
-  "evidence_strength": "strong",
-  "user_segments": ["segment1", "segment2"],
-  "time_to_effect": "2-4 weeks",
-  "sustainability": "long-term"
-}}]
-Output ONLY valid JSON array."""
 
-        response = invoke_with_retry(prompt).strip()
-        
-        # Clean markdown code blocks using utility function
-        response = clean_json_response(response)
+def _build_benefits_block(product: ProductModel, detailed: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Organize scored benefits into the block structure used by templates."""
+    # Organize by category for easier template access, gathering the
+    # aggregate metrics in the same pass
+    by_category = {
+        "immediate_result": [],
+        "long_term_care": [],
+        "quality_of_life": []
+    }
+    confidence_counts = {"high": 0, "medium": 0, "low": 0}
+    impact_sum = 0.0
+    high_impact_count = 0
+    
+    for item in detailed:
+        by_category.get(item.get("category"), by_category["quality_of_life"]).append(item)
         
-        detailed = json.loads(response)
+        score = item.get("impact_score", 5.0)
+        impact_sum += score
+        if score >= 7:
+            high_impact_count += 1
         
-        # Organize by category for easier template access
-        by_category = {
+        conf = item.get("confidence", "medium")
+        if conf in confidence_counts:
+            confidence_counts[conf] += 1
+    
+    avg_impact = impact_sum / len(detailed) if detailed else 0
+    
+    # Rank benefits by impact
+    ranked_benefits = sorted(detailed, key=lambda x: x.get("impact_score", 0), reverse=True)
+    
+    return {
+        "primary_benefits": product.benefits.copy(),
+        "detailed_benefits": detailed,
+        "ranked_benefits": ranked_benefits,  # Sorted by impact
+        "benefits_by_category": by_category,
+        "total_benefits": len(product.benefits),
+        "metrics": {  # Aggregate metrics
+            "avg_impact_score": round(avg_impact, 2),
+            "high_impact_count": high_impact_count,
+            "top_benefit": ranked_benefits[0]["benefit"] if ranked_benefits else None,
+            "confidence_distribution": confidence_counts
+        }
+    }
+
+
+def _fallback_benefits_block(product: ProductModel) -> Dict[str, Any]:
+    """Basic scoring used when the LLM response is unavailable."""
+    fallback_detailed = [
+        {
+            "benefit": b, 
+            "description": f"{product.name} provides {b}.", 
+            "category": "quality_of_life",
+            "impact_score": 5.0,
+            "confidence": "medium",
+            "evidence_strength": "moderate",
+            "user_segments": product.target_users,
+            "time_to_effect": "varies",
+            "sustainability": "long-term"
+        } 
+        for b in product.benefits
+    ]
+    return {
+        "primary_benefits": product.benefits.copy(),
+        "detailed_benefits": fallback_detailed,
+        "ranked_benefits": fallback_detailed,
+        "benefits_by_category": {
             "immediate_result": [],
             "long_term_care": [],
-            "quality_of_life": []
-        }
-        
-        for item in detailed:
-            cat = item.get("category", "quality_of_life")
-            if cat in by_category:
-                by_category[cat].append(item)
-            else:
-                by_category["quality_of_life"].append(item)
-        
-        # Calculate aggregate metrics
-        impact_scores = [item.get("impact_score", 5.0) for item in detailed]
-        avg_impact = sum(impact_scores) / len(impact_scores) if impact_scores else 0
-        
-        # Rank benefits by impact
-        ranked_benefits = sorted(detailed, key=lambda x: x.get("impact_score", 0), reverse=True)
-        
-        # Count by confidence level
-        confidence_counts = {"high": 0, "medium": 0, "low": 0}
-        for item in detailed:
-            conf = item.get("confidence", "medium")
-            if conf in confidence_counts:
-                confidence_counts[conf] += 1
-        
-        return {
-            "primary_benefits": product.benefits.copy(),
-            "detailed_benefits": detailed,
-            "ranked_benefits": ranked_benefits,  # Sorted by impact
-            "benefits_by_category": by_category,
-            "total_benefits": len(product.benefits),
-            "metrics": {  # Aggregate metrics
-                "avg_impact_score": round(avg_impact, 2),
-                "high_impact_count": len([s for s in impact_scores if s >= 7]),
-                "top_benefit": ranked_benefits[0]["benefit"] if ranked_benefits else None,
-                "confidence_distribution": confidence_counts
-            }
-        }
-    except Exception as e:
-        logger.warning(f"Benefits block LLM failed: {e}")
-        # Fallback with basic scoring
-        fallback_detailed = [
-            {
-                "benefit": b, 
-                "description": f"{product.name} provides {b}.", 
-                "category": "quality_of_life",
-                "impact_score": 5.0,
-                "confidence": "medium",
-                "evidence_strength": "moderate",
-                "user_segments": product.target_users,
-                "time_to_effect": "varies",
-                "sustainability": "long-term"
-            } 
-            for b in product.benefits
-        ]
-        return {
-            "primary_benefits": product.benefits.copy(),
-            "detailed_benefits": fallback_detailed,
-            "ranked_benefits": fallback_detailed,
-            "benefits_by_category": {
-                "immediate_result": [],
-                "long_term_care": [],
-                "quality_of_life": fallback_detailed
-            },
-            "total_benefits": len(product.benefits),
-            "metrics": {
-                "avg_impact_score": 5.0,
-                "high_impact_count": 0,
-                "top_benefit": product.benefits[0] if product.benefits else None,
-                "confidence_distribution": {"high": 0, "medium": len(product.benefits), "low": 0}
-            }
+            "quality_of_life": fallback_detailed
+        },
+        "total_benefits": len(product.benefits),
+        "metrics": {
+            "avg_impact_score": 5.0,
+            "high_impact_count": 0,
+            "top_benefit": product.benefits[0] if product.benefits else None,
+            "confidence_distribution": {"high": 0, "medium": len(product.benefits), "low": 0}
         }
+    }
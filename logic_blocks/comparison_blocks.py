@@ -10,7 +10,7 @@ import logging
 
 
 from models import ProductModel
-from config import invoke_with_retry
+from config import invoke_memoized
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ def compare_ingredients_block(product_a: ProductModel, product_b: ProductModel)
 {product_b.name}: {', '.join(product_b.key_features)}
 Write a brief 2-sentence comparison. Output ONLY the text."""
 
-        analysis = invoke_with_retry(prompt).strip()
+        analysis = invoke_memoized(prompt).strip()
     except Exception as e:
         logger.warning(f"Comparison analysis failed: {e}")
         analysis = f"Both products offer distinct features for their target users."
@@ -47,13 +47,14 @@ Write a brief 2-sentence comparison. Output ONLY the text."""
 
 def compare_benefits_block(product_a: ProductModel, product_b: ProductModel) -> Dict[str, Any]:
     """Compare benefits between two products."""
-    benefits_a = set(b.lower() for b in product_a.benefits)
-    benefits_b = set(b.lower() for b in product_b.benefits)
+    # Lowercase each benefit once and reuse it for matching
+    lower_a = [(b, b.lower()) for b in product_a.benefits]
+    lower_b = [(b, b.lower()) for b in product_b.benefits]
     
-    common_lower = benefits_a & benefits_b
-    unique_a = [b for b in product_a.benefits if b.lower() not in common_lower]
-    unique_b = [b for b in product_b.benefits if b.lower() not in common_lower]
-    common = [b for b in product_a.benefits if b.lower() in common_lower]
+    common_lower = {low for _, low in lower_a} & {low for _, low in lower_b}
+    unique_a = [b for b, low in lower_a if low not in common_lower]
+    unique_b = [b for b, low in lower_b if low not in common_lower]
+    common = [b for b, low in lower_a if low in common_lower]
     
     try:
         prompt = f"""Compare benefits of "{product_a.name}" vs "{product_b.name}".
@@ -61,7 +62,7 @@ def compare_benefits_block(product_a: ProductModel, product_b: ProductModel) ->
 {product_b.name}: {', '.join(product_b.benefits)}
 Write a brief 2-sentence comparison. Output ONLY the text."""
 
-        analysis = invoke_with_retry(prompt).strip()
+        analysis = invoke_memoized(prompt).strip()
     except Exception as e:
         logger.warning(f"Benefits comparison failed: {e}")
         analysis = f"Both products target similar needs with different approaches."
@@ -0,0 +1,29 @@
+"""
+Concurrent Logic Block Runner.
+
+Each logic block makes its own blocking LLM call, so blocks that do not
+depend on each other run on a shared thread pool and finish in roughly the
+time of the slowest one instead of the sum of all of them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Shared by every agent; the agents themselves already run as parallel graph
+# nodes, so the pool bounds total in-flight block calls across all of them.
+_BLOCK_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="logic_block")
+
+
+def run_blocks(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent block calls concurrently.
+    
+    Args:
+        calls: Result name -> zero-argument callable (e.g. a functools.partial)
+        
+    Returns:
+        Result name -> block result, in the order of ``calls``. An exception
+        from any block is re-raised, as it would be if run sequentially.
+    """
+    futures = {name: _BLOCK_EXECUTOR.submit(call) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -5,11 +5,12 @@ Uses LangGraph StateGraph for workflow orchestration.
 """
 
 from orchestrator.state import WorkflowState, create_initial_state
-from orchestrator.workflow import create_workflow, run_workflow
+from orchestrator.workflow import create_workflow, run_workflow, arun_workflow
 
 __all__ = [
     "WorkflowState",
     "create_initial_state",
     "create_workflow",
-    "run_workflow"
+    "run_workflow",
+    "arun_workflow"
 ]
@@ -33,9 +33,11 @@ class WorkflowState(TypedDict):
         product_content: Product page content
         comparison_content: Comparison page content
         output_files: List of generated file paths
+        output_documents: Dict of output file name -> rendered document
         errors: List of error messages (supports concurrent append)
         logs: List of log messages (supports concurrent append)
         prompts: Dict of prompt_hash -> prompt_text for observability
+                 (only filled when DEBUG logging or KASPARRO_STORE_PROMPTS is on)
         metrics: Dict of node_name -> {tokens_in, tokens_out, output_len, elapsed_s}
         current_step: Name of current workflow step
     """
@@ -55,6 +57,7 @@ class WorkflowState(TypedDict):
     
     # Final outputs
     output_files: List[str]
+    output_documents: Dict[str, Dict[str, Any]]
     
     # Metadata - use Annotated for concurrent append in parallel nodes
     errors: Annotated[List[str], operator.add]
@@ -92,6 +95,7 @@ def create_initial_state(product_data: Dict[str, Any]) -> WorkflowState:
         product_content={},
         comparison_content={},
         output_files=[],
+        output_documents={},
         errors=[],
         warnings=[],
         logs=["Workflow initialized"],
@@ -5,8 +5,10 @@ Defines the StateGraph that orchestrates all 6 agents:
 START -> Parser -> Question Generator -> [FAQ, Product, Comparison] -> Output -> END
 """
 
+import asyncio
+import inspect
 import logging
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
@@ -115,6 +117,13 @@ def generate_questions_node(state: WorkflowState) -> Dict[str, Any]:
         updates["questions"] = [q.model_dump() for q in questions]
         logger.info(f"✅ Question Generator: Generated {len(questions)} questions")
     
+    warnings = agent_metrics.get("warnings", [])
+    if warnings:
+        updates["warnings"] = warnings
+        updates["logs"].extend(
+            f"{datetime.now().isoformat()} - Question Generator Agent: {w}" for w in warnings
+        )
+    
     if errors:
         updates["errors"] = errors
     
@@ -429,6 +438,7 @@ def output_node(state: WorkflowState) -> Dict[str, Any]:
 
     updates: Dict[str, Any] = {
         "output_files": output_files,
+        "output_documents": agent.documents,
         # Mark completed if we produced at least one file, otherwise failed.
         "current_step": "completed" if output_files else "failed",
         "logs": [
@@ -541,6 +551,107 @@ def create_workflow() -> StateGraph:
     return compiled
 
 
+# Tracked nodes and their display names, shared by run_workflow / arun_workflow.
+# Progress is the fraction of these that have completed, so the parallel
+# FAQ/Product/Comparison stage advances the bar in whatever order it finishes.
+NODE_PROGRESS = {
+    "parse": "Parser Agent",
+    "generate_questions": "Question Generator",
+    "faq": "FAQ Agent",
+    "product_page": "Product Page Agent",
+    "comparison": "Comparison Agent",
+    "validate_content": "Content Validation",
+    "output": "Output Agent",
+}
+
+# Progress band covered by node completions (setup reports below it, "Completed" is 1.0)
+_PROGRESS_START = 0.10
+_PROGRESS_END = 0.98
+
+# Upper bound on nodes LangGraph runs at once during the fan-out stage.
+# Keeps the FAQ/Product/Comparison burst within Groq rate limits.
+MAX_CONCURRENT_NODES = 4
+
+
+def _report_node_progress(
+    node_name: str,
+    node_result: Any,
+    progress_callback: Optional[Callable[[str, float], None]],
+    completed: Set[str]
+) -> Optional[float]:
+    """Forward a completed node to the progress callback, if it is tracked.
+    
+    Args:
+        node_name: Name of the node that finished
+        node_result: The node's state update
+        progress_callback: Optional progress callback
+        completed: Tracked nodes finished so far in this run; updated in place
+        
+    Returns:
+        The progress fraction reported, or None for untracked nodes
+    """
+    if node_name not in NODE_PROGRESS:
+        return None
+    step_name = NODE_PROGRESS[node_name]
+    completed.add(node_name)
+    pct = _PROGRESS_START + (_PROGRESS_END - _PROGRESS_START) * len(completed) / len(NODE_PROGRESS)
+    # Extract metrics from node result for enriched callback
+    node_metrics = node_result.get("metrics", {}) if isinstance(node_result, dict) else {}
+    if progress_callback:
+        # Pass metrics as optional third argument (backward compatible)
+        try:
+            progress_callback(f"{step_name} complete", pct, node_metrics)
+        except TypeError:
+            # Fallback for callbacks that don't accept metrics
+            progress_callback(f"{step_name} complete", pct)
+    logger.info(f"Progress: {step_name} ({int(pct*100)}%)")
+    return pct
+
+
+def _accepts_metrics(callback: Callable[..., Any]) -> bool:
+    """Whether ``callback`` can be called as callback(step, progress, metrics)."""
+    try:
+        inspect.signature(callback).bind("", 0.0, {})
+    except TypeError:
+        return False
+    except ValueError:
+        # No introspectable signature; assume the full form
+        return True
+    return True
+
+
+def _finalize_state(
+    state: WorkflowState,
+    final_state: Optional[Dict[str, Any]],
+    progress_callback: Optional[Callable[[str, float], None]]
+) -> WorkflowState:
+    """Adopt the last state LangGraph produced and mark failures."""
+    # Defer to the final state produced by LangGraph instead of
+    # shallow-updating the initial state.
+    if final_state is not None:
+        state = final_state
+    
+    # A1: Mark as failed if any errors occurred during workflow
+    if state.get("errors"):
+        state["current_step"] = "failed"
+        logger.warning(f"Workflow completed with {len(state['errors'])} errors")
+    
+    if progress_callback:
+        progress_callback("Completed", 1.0)
+    
+    logger.info("Workflow completed successfully via LangGraph")
+    return state
+
+
+def _failed_state(product_data: Dict[str, Any], error: Exception) -> WorkflowState:
+    """Build the state returned when the workflow raises."""
+    logger.error(f"Workflow failed: {str(error)}")
+    state = create_initial_state(product_data)
+    state["errors"].append(f"Workflow error: {str(error)}")
+    state["current_step"] = "failed"
+    return state
+
+
 def run_workflow(
     product_data: Dict[str, Any],
     progress_callback: Optional[Callable[[str, float], None]] = None
@@ -567,17 +678,6 @@ def run_workflow(
     """
     logger.info("Starting multi-agent workflow using LangGraph")
     
-    # Node-to-progress percentage mapping
-    NODE_PROGRESS = {
-        "parse": ("Parser Agent", 0.15),
-        "generate_questions": ("Question Generator", 0.30),
-        "faq": ("FAQ Agent", 0.50),
-        "product_page": ("Product Page Agent", 0.65),
-        "comparison": ("Comparison Agent", 0.80),
-        "validate_content": ("Content Validation", 0.90),
-        "output": ("Output Agent", 0.98),
-    }
-    
     try:
         if progress_callback:
             progress_callback("Initializing workflow...", 0.05)
@@ -595,47 +695,110 @@ def run_workflow(
         # LangGraph handles Annotated list merging internally, so we
         # simply keep track of the latest merged state object it yields.
         final_state = None
-        for node_output in compiled.stream(state):
+        completed: Set[str] = set()
+        for node_output in compiled.stream(state, {"max_concurrency": MAX_CONCURRENT_NODES}):
             # node_output is a dict with the node name as key
             for node_name, node_result in node_output.items():
-                if node_name in NODE_PROGRESS:
-                    step_name, pct = NODE_PROGRESS[node_name]
-                    # Extract metrics from node result for enriched callback
-                    node_metrics = node_result.get("metrics", {}) if isinstance(node_result, dict) else {}
-                    if progress_callback:
-                        # Pass metrics as optional third argument (backward compatible)
-                        try:
-                            progress_callback(f"{step_name} complete", pct, node_metrics)
-                        except TypeError:
-                            # Fallback for callbacks that don't accept metrics
-                            progress_callback(f"{step_name} complete", pct)
-                    logger.info(f"Progress: {step_name} ({int(pct*100)}%)")
+                _report_node_progress(node_name, node_result, progress_callback, completed)
                 # node_result is already the merged state produced by LangGraph
                 if isinstance(node_result, dict):
                     final_state = node_result
         
-        # Defer to the final state produced by LangGraph instead of
-        # shallow-updating the initial state.
-        if final_state is not None:
-            state = final_state
+        return _finalize_state(state, final_state, progress_callback)
         
-        # A1: Mark as failed if any errors occurred during workflow
-        if state.get("errors"):
-            state["current_step"] = "failed"
-            logger.warning(f"Workflow completed with {len(state['errors'])} errors")
+    except Exception as e:
+        return _failed_state(product_data, e)
+
+
+async def arun_workflow(
+    product_data: Dict[str, Any],
+    progress_callback: Optional[Callable[..., Any]] = None
+) -> WorkflowState:
+    """
+    Async variant of run_workflow for callers that own an event loop.
+    
+    Uses LangGraph's astream(), which runs the synchronous agent nodes on
+    executor threads so the FAQ, Product Page and Comparison agents are
+    awaited concurrently after question generation, bounded by
+    MAX_CONCURRENT_NODES. Progress reporting and the returned state match
+    run_workflow, with an extra "<Agent> running..." event as each node
+    starts so the UI reflects work in flight rather than only completions.
+    
+    Args:
+        product_data: Raw product data dictionary
+        progress_callback: Optional callback for progress updates. May be a
+                          plain function or a coroutine function; async
+                          callbacks are awaited on the workflow's loop.
+        
+    Returns:
+        Final workflow state with all outputs
+    """
+    logger.info("Starting multi-agent workflow using LangGraph (async)")
+    
+    if progress_callback and inspect.iscoroutinefunction(progress_callback):
+        async_callback = progress_callback
+        # Decide once whether the callback takes the metrics argument; the
+        # sync helpers' TypeError fallback never fires for the queueing shim
+        takes_metrics = _accepts_metrics(async_callback)
+        
+        # Collect events from the sync helpers and await them in order
+        pending: List[Tuple[Any, ...]] = []
+        
+        def progress_callback(step: str, progress: float, metrics: Optional[Dict[str, Any]] = None) -> None:
+            pending.append((step, progress, metrics) if takes_metrics else (step, progress))
+        
+        async def flush() -> None:
+            # Never raises: a failing progress callback must not fail the run
+            while pending:
+                args = pending.pop(0)
+                try:
+                    await async_callback(*args)
+                except Exception as e:
+                    logger.warning(f"Progress callback failed for {args[0]!r}: {e}")
+    else:
+        async def flush() -> None:
+            return None
+    
+    try:
+        if progress_callback:
+            progress_callback("Initializing workflow...", 0.05)
+        
+        state = create_initial_state(product_data)
+        # Graph compilation is plain sync work; keep it off the event loop
+        compiled = await asyncio.to_thread(create_workflow)
         
         if progress_callback:
-            progress_callback("Completed", 1.0)
+            progress_callback("Executing LangGraph workflow...", 0.10)
+        await flush()
+        
+        final_state = None
+        completed: Set[str] = set()
+        last_pct = _PROGRESS_START
+        async for mode, event in compiled.astream(
+            state,
+            {"max_concurrency": MAX_CONCURRENT_NODES},
+            stream_mode=["updates", "tasks"]
+        ):
+            if mode == "tasks":
+                # Task events without a result mark a node starting
+                if "result" not in event and event.get("name") in NODE_PROGRESS and progress_callback:
+                    progress_callback(f"{NODE_PROGRESS[event['name']]} running...", last_pct)
+            else:
+                for node_name, node_result in event.items():
+                    pct = _report_node_progress(node_name, node_result, progress_callback, completed)
+                    if pct is not None:
+                        last_pct = pct
+                    if isinstance(node_result, dict):
+                        final_state = node_result
+            await flush()
         
-        logger.info("Workflow completed successfully via LangGraph")
+        state = _finalize_state(state, final_state, progress_callback)
+        await flush()
         return state
         
     except Exception as e:
-        logger.error(f"Workflow failed: {str(e)}")
-        state = create_initial_state(product_data)
-        state["errors"].append(f"Workflow error: {str(e)}")
-        state["current_step"] = "failed"
-        return state
+        await flush()
+        return _failed_state(product_data, e)
 
 
 # Also provide access to the StateGraph for documentation/visualization
@@ -63,3 +63,27 @@ class TestFAQAgent:
         # Should have questions from multiple categories
         selected_categories = set(q.category for q in selected)
         assert len(selected_categories) >= 3  # At least 3 different categories
+    
+    def test_stored_prompts_keep_prompt_text(self, monkeypatch, sample_product):
+        """Test that KASPARRO_STORE_PROMPTS keeps the text returned by invoke_with_metrics."""
+        import agents.faq_agent as faq_module
+        
+        def fake_invoke(prompt):
+            return "An answer.", {"prompt_hash": str(hash(prompt))}, prompt
+        
+        monkeypatch.setenv("KASPARRO_STORE_PROMPTS", "1")
+        monkeypatch.setattr(faq_module, "invoke_with_metrics", fake_invoke)
+        agent = FAQAgent()
+        monkeypatch.setattr(agent, "_generate_blocks", lambda product: {
+            "benefits_block": {}, "usage_block": {}, "safety_block": {}
+        })
+        questions = [
+            QuestionModel(id=f"q{i}", category=category, question=f"Question {i} here?")
+            for i, category in enumerate(list(QuestionCategory) * 4)
+        ]
+        
+        _, _, metrics = agent.execute(sample_product, questions)
+        
+        stored = list(metrics["prompts"].values())
+        assert stored and all(stored)
+        assert all(any(q.question in text for q in questions) for text in stored)
@@ -0,0 +1,78 @@
+"""
+Tests for QuestionGeneratorAgent.
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import agents.question_generator_agent as question_module
+from agents import QuestionGeneratorAgent
+from models import QuestionCategory
+
+
+class TestQuestionGeneratorAgent:
+    """Tests for QuestionGeneratorAgent class."""
+    
+    def test_template_fallback_meets_minimum(self, sample_product):
+        """Test that template fallback produces the requested number of questions."""
+        agent = QuestionGeneratorAgent()
+        questions = agent._template_fallback_questions(sample_product, 0, agent.min_questions)
+        
+        assert len(questions) == agent.min_questions
+        assert all(q.question.endswith("?") for q in questions)
+        assert {q.category for q in questions} == set(QuestionCategory)
+    
+    def test_soft_deadline_serves_templates(self, monkeypatch, sample_product):
+        """Test that a slow LLM call is abandoned in favour of template questions."""
+        def slow_invoke(prompt):
+            time.sleep(0.5)
+            return "[]", {"prompt_hash": "x"}, prompt
+        
+        monkeypatch.setattr(question_module, "invoke_with_metrics", slow_invoke)
+        agent = QuestionGeneratorAgent(soft_deadline_s=0.05)
+        
+        questions, errors, metrics = agent.execute(sample_product)
+        
+        assert errors == []
+        assert len(questions) == agent.min_questions
+        assert questions[0].question == f"What makes {sample_product.name} unique?"
+        assert "soft deadline" in metrics["warnings"][0]
+    
+    def test_soft_deadline_off_by_default(self, monkeypatch, sample_product):
+        """Test that without a deadline the agent waits for the LLM inline."""
+        threads = []
+        
+        def slow_invoke(prompt):
+            threads.append(threading.current_thread())
+            time.sleep(0.1)
+            return '[{"category": "Usage", "question": "How do I use it?"}]', {"prompt_hash": "x"}, prompt
+        
+        monkeypatch.setattr(question_module, "invoke_with_metrics", slow_invoke)
+        monkeypatch.setattr(question_module, "QUESTION_SOFT_DEADLINE_S", 0.0)
+        agent = QuestionGeneratorAgent()
+        monkeypatch.setattr(agent, "_generate_additional_questions", lambda product, existing: [])
+        
+        questions, _, metrics = agent.execute(sample_product)
+        
+        assert agent.soft_deadline_s is None
+        assert [q.question for q in questions] == ["How do I use it?"]
+        assert metrics["warnings"] == []
+        assert threads == [threading.current_thread()]
+    
+    def test_parse_response_skips_normalized_duplicates(self, sample_product):
+        """Test that questions differing only in case/punctuation are emitted once."""
+        agent = QuestionGeneratorAgent()
+        response = (
+            '[{"category": "Informational", "question": "What is X?"},'
+            ' {"category": "Usage", "question": "what is x"},'
+            ' {"category": "Usage", "question": "How do I use X?"}]'
+        )
+        
+        questions = agent._parse_response(response, sample_product)
+        
+        assert [q.question for q in questions] == ["What is X?", "How do I use X?"]
@@ -161,6 +161,66 @@ class TestLogicBlocks:
         assert callable(compare_ingredients_block)
         assert callable(compare_benefits_block)
         assert callable(generate_pricing_block)
+    
+    def test_all_exports_resolve(self):
+        """Every lazily loaded export must resolve to a callable."""
+        import logic_blocks
+        for name in logic_blocks.__all__:
+            assert callable(getattr(logic_blocks, name))
+        with pytest.raises(AttributeError):
+            logic_blocks.not_a_block
+    
+    def test_run_blocks_runs_concurrently_in_order(self):
+        """Independent blocks overlap and results keep their names."""
+        import threading
+        from logic_blocks import run_blocks
+        
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def block(value):
+            barrier.wait()  # Only passes if all three run at once
+            return value
+        
+        results = run_blocks({name: (lambda n=name: block(n)) for name in ("a", "b", "c")})
+        assert list(results.items()) == [("a", "a"), ("b", "b"), ("c", "c")]
+
+    def test_benefits_bulk_fans_out_single_call(self, monkeypatch):
+        """One LLM call scores every product; missing or malformed entries fall back."""
+        import json
+        from fixtures import get_example_product
+        from models import ProductModel
+        from logic_blocks import benefits_block
+
+        product = ProductModel(**get_example_product())
+        prompts = []
+
+        def fake_invoke(prompt, parse):
+            prompts.append(prompt)
+            return parse(json.dumps([
+                {"product_id": 1, "benefits": [
+                    {"benefit": "Glow", "impact_score": 9, "confidence": "high"},
+                    {"benefit": "Calm", "impact_score": 4, "category": "long_term_care"},
+                ]},
+                {"product_id": 2, "benefits": [{"impact_score": 8}]},  # No "benefit"
+                {"product_id": "4", "benefits": [{"benefit": "Firm", "impact_score": 8}]},
+                {"product_id": "x", "benefits": []},
+            ]))
+
+        monkeypatch.setattr(benefits_block, "invoke_memoized", fake_invoke)
+        blocks = benefits_block.generate_benefits_blocks_bulk([product] * 4)
+
+        assert len(prompts) == 1
+        assert prompts[0].startswith(benefits_block._BENEFITS_RUBRIC)  # Static prefix
+        assert blocks[0]["metrics"] == {
+            "avg_impact_score": 6.5,
+            "high_impact_count": 1,
+            "top_benefit": "Glow",
+            "confidence_distribution": {"high": 1, "medium": 1, "low": 0},
+        }
+        assert [b["benefit"] for b in blocks[0]["benefits_by_category"]["long_term_care"]] == ["Calm"]
+        assert blocks[1]["metrics"]["avg_impact_score"] == 5.0  # Fallback
+        assert blocks[2]["metrics"]["avg_impact_score"] == 5.0  # Fallback
+        assert blocks[3]["metrics"]["top_benefit"] == "Firm"  # String id matched
 
 
 # =============================================================================
@@ -236,6 +296,18 @@ class TestJSONOutput:
         agent = OutputAgent()
         assert agent is not None
     
+    def test_output_agent_keeps_written_documents(self, tmp_path):
+        """Written documents are kept in memory, keyed by file name."""
+        from agents import OutputAgent
+        agent = OutputAgent(output_dir=str(tmp_path))
+        data = {"questions": [{"question": "Q?", "answer": "A."}]}
+        
+        agent._write_json(os.path.join(agent.output_path, "faq.json"), data)
+        
+        with open(tmp_path / "faq.json", 'r') as f:
+            assert json.load(f) == data
+        assert agent.documents == {"faq.json": data}
+    
     def test_output_files_are_valid_json(self):
         """All output files must be valid JSON."""
         output_dir = os.path.join(os.path.dirname(__file__), '..', 'output')
@@ -0,0 +1,435 @@
+"""
+Config Tests.
+
+Tests for LLM invocation helpers in config.py. The Groq client is replaced
+with a fake so no API key or network access is needed.
+"""
+
+import functools
+import logging
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+class _FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class TestClientCache:
+    """Tests for per-key client reuse."""
+
+    def test_get_llm_reuses_cached_client(self, monkeypatch):
+        built = []
+
+        @functools.lru_cache(maxsize=2)
+        def fake_build(api_key, model, temperature, max_tokens):
+            built.append(api_key)
+            return object()
+
+        keys = iter(["key-a", "key-a", "key-b", "key-c", "key-a"])
+        monkeypatch.setattr(config, "_get_next_key", lambda: next(keys))
+        monkeypatch.setattr(config, "_build_client", fake_build)
+
+        assert config.get_llm() is config.get_llm()
+        config.get_llm()
+        config.get_llm()
+        config.get_llm()
+        # key-a was evicted by key-b and key-c, so it is rebuilt
+        assert built == ["key-a", "key-b", "key-c", "key-a"]
+
+
+class TestSecretCache:
+    """Tests for cached get_secret lookups."""
+
+    def test_lookup_is_cached_until_cleared(self, monkeypatch):
+        monkeypatch.setattr(config, "_secret_cache", {})
+        monkeypatch.setenv("KASPARRO_TEST_SECRET", "first")
+        assert config.get_secret("KASPARRO_TEST_SECRET") == "first"
+
+        monkeypatch.setenv("KASPARRO_TEST_SECRET", "second")
+        assert config.get_secret("KASPARRO_TEST_SECRET") == "first"
+
+        config.clear_secret_cache()
+        assert config.get_secret("KASPARRO_TEST_SECRET") == "second"
+
+    def test_missing_secret_uses_default(self, monkeypatch):
+        monkeypatch.setattr(config, "_secret_cache", {})
+        monkeypatch.delenv("KASPARRO_TEST_SECRET", raising=False)
+        assert config.get_secret("KASPARRO_TEST_SECRET") == ""
+        assert config.get_secret("KASPARRO_TEST_SECRET", "fallback") == "fallback"
+
+    def test_secret_added_later_is_found(self, monkeypatch):
+        monkeypatch.setattr(config, "_secret_cache", {})
+        monkeypatch.delenv("KASPARRO_TEST_SECRET", raising=False)
+        assert config.get_secret("KASPARRO_TEST_SECRET") == ""
+
+        monkeypatch.setenv("KASPARRO_TEST_SECRET", "added")
+        assert config.get_secret("KASPARRO_TEST_SECRET") == "added"
+
+
+class TestApiKeys:
+    """Tests for API key parsing and caching."""
+
+    def test_parse_skips_blank_and_short_keys(self):
+        assert config._parse_api_keys("key-aaaaaaaa, ,short,key-bbbbbbbb") == (
+            "key-aaaaaaaa",
+            "key-bbbbbbbb",
+        )
+        assert config._parse_api_keys("") == ()
+
+    def test_keys_reparsed_only_when_secret_changes(self, monkeypatch):
+        secret = {"value": "key-aaaaaaaa"}
+        parsed = []
+        real_parse = config._parse_api_keys
+
+        def counting_parse(key_string):
+            parsed.append(key_string)
+            return real_parse(key_string)
+
+        monkeypatch.setattr(config, "_state", config._State())
+        monkeypatch.setattr(config, "get_secret", lambda key, default="": secret["value"])
+        monkeypatch.setattr(config, "_parse_api_keys", counting_parse)
+
+        assert config._get_api_keys() == ("key-aaaaaaaa",)
+        assert config._get_api_keys() == ("key-aaaaaaaa",)
+        secret["value"] = "key-bbbbbbbb"
+        assert config._get_api_keys() == ("key-bbbbbbbb",)
+        assert parsed == ["key-aaaaaaaa", "key-bbbbbbbb"]
+
+    def test_next_key_rotates_and_follows_key_changes(self, monkeypatch):
+        keys = {"value": ("key-a", "key-b")}
+        monkeypatch.setattr(config, "_get_api_keys", lambda: keys["value"])
+        monkeypatch.setattr(config, "_state", config._State())
+
+        assert [config._get_next_key() for _ in range(3)] == ["key-a", "key-b", "key-a"]
+        keys["value"] = ("key-c",)
+        assert [config._get_next_key() for _ in range(2)] == ["key-c", "key-c"]
+
+    def test_next_key_without_keys_raises(self, monkeypatch):
+        monkeypatch.setattr(config, "_get_api_keys", lambda: ())
+        with pytest.raises(ValueError, match="GROQ_API_KEY not set"):
+            config._get_next_key()
+
+
+class TestRateLimitDetection:
+    """Tests for the retryable-error pattern."""
+
+    @pytest.mark.parametrize("message", [
+        "Error code: 429 - Too Many Requests",
+        "Rate limit reached for model",
+        "rate_limit_exceeded",
+        "Quota exceeded for this key",
+    ])
+    def test_rate_limit_messages_match(self, message):
+        assert config._RATE_LIMIT_RE.search(message)
+
+    @pytest.mark.parametrize("message", [
+        "Failed to generate content",
+        "invalid request",
+    ])
+    def test_other_errors_do_not_match(self, message):
+        assert not config._RATE_LIMIT_RE.search(message)
+
+
+class _HeaderError(Exception):
+    """Exception carrying a response with headers, like groq.RateLimitError."""
+
+    def __init__(self, headers):
+        super().__init__("Error code: 429")
+        self.response = type("Response", (), {"headers": headers})()
+
+
+class TestComputeBackoff:
+    """Tests for retry delay selection."""
+
+    def test_uses_retry_after_header(self):
+        assert config._compute_backoff(0, _HeaderError({"retry-after": "2.5"})) == 2.5
+
+    @pytest.mark.parametrize("value, expected", [
+        ("7.66s", 7.66),
+        ("1m2s", 62.0),
+        ("120ms", 0.12),
+    ])
+    def test_parses_reset_durations(self, value, expected):
+        exc = _HeaderError({"x-ratelimit-reset-requests": value})
+        assert config._retry_after_seconds(exc) == pytest.approx(expected)
+
+    def test_caps_long_delays(self):
+        exc = _HeaderError({"x-ratelimit-reset-tokens": "2m59.56s"})
+        assert config._compute_backoff(0, exc) == config.MAX_RETRY_AFTER_S
+
+    def test_falls_back_to_exponential_backoff(self):
+        wait = config._compute_backoff(2, RuntimeError("429"))
+        assert 4 <= wait < 5
+
+
+class TestSlidingWindow:
+    """Tests for the preemptive per-key rate limiter."""
+
+    def test_request_budget(self):
+        window = config._SlidingWindow(rpm=2, tpm=0, window_s=60.0)
+        assert window.reserve(10, now=0.0) == 0.0
+        assert window.reserve(10, now=1.0) == 0.0
+        assert window.reserve(10, now=2.0) == 58.0
+        # The first request has aged out of the window
+        assert window.reserve(10, now=60.0) == 0.0
+
+    def test_token_budget(self):
+        window = config._SlidingWindow(rpm=0, tpm=100, window_s=60.0)
+        assert window.reserve(70, now=0.0) == 0.0
+        assert window.reserve(40, now=5.0) == 55.0
+        assert window.reserve(30, now=5.0) == 0.0
+
+    def test_oversized_request_admitted_when_window_empty(self):
+        window = config._SlidingWindow(rpm=0, tpm=100, window_s=60.0)
+        assert window.reserve(500, now=0.0) == 0.0
+
+    def test_budget_includes_output_tokens(self):
+        assert config._budget_tokens("abcd") == (
+            config._estimate_tokens("abcd") + config.MAX_OUTPUT_TOKENS
+        )
+
+    @pytest.mark.parametrize("raw, expected", [("", 7), ("12", 12), ("-3", 0), ("lots", 7)])
+    def test_env_int_parsing(self, monkeypatch, raw, expected):
+        monkeypatch.setenv("KASPARRO_TEST_INT", raw)
+        assert config._env_int("KASPARRO_TEST_INT", 7) == expected
+
+
+class TestInvokeWithMetrics:
+    """Tests for token accounting in invoke_with_metrics."""
+
+    class _Client:
+        def __init__(self, usage):
+            self.usage = usage
+            self.counted = []
+
+        def get_num_tokens(self, text):
+            self.counted.append(text)
+            return 99
+
+        def invoke(self, prompt):
+            response = _FakeResponse("answer")
+            response.usage_metadata = self.usage
+            return response
+
+    def _run(self, monkeypatch, client):
+        monkeypatch.setattr(config, "_get_next_key", lambda: "test-key")
+        monkeypatch.setattr(config, "_get_cached_client", lambda api_key: client)
+        monkeypatch.setattr(config, "_rate_limiters", {})
+        monkeypatch.setattr(config, "_AIMD", config._AIMDController())
+        monkeypatch.setattr(config, "_state", config._State())
+        return config.invoke_with_metrics("prompt")
+
+    def test_uses_provider_usage(self, monkeypatch):
+        client = self._Client({"input_tokens": 12, "output_tokens": 3})
+        text, metrics, _ = self._run(monkeypatch, client)
+        assert text == "answer"
+        assert (metrics["tokens_in"], metrics["tokens_out"]) == (12, 3)
+        assert client.counted == []
+        assert metrics["cached_tokens"] == 0
+
+    def test_reports_cached_prompt_tokens(self, monkeypatch):
+        client = self._Client({
+            "input_tokens": 12,
+            "output_tokens": 3,
+            "input_token_details": {"cache_read": 8},
+        })
+        _, metrics, _ = self._run(monkeypatch, client)
+        assert metrics["cached_tokens"] == 8
+
+    def test_counts_locally_without_usage(self, monkeypatch):
+        client = self._Client(None)
+        _, metrics, _ = self._run(monkeypatch, client)
+        assert (metrics["tokens_in"], metrics["tokens_out"]) == (99, 99)
+        assert client.counted == ["prompt", "answer"]
+
+    def test_failed_tokenizer_falls_back_to_estimate_once(self, monkeypatch):
+        class NoTokenizer(self._Client):
+            def get_num_tokens(self, text):
+                self.counted.append(text)
+                raise ImportError("transformers not installed")
+
+        client = NoTokenizer(None)
+        _, metrics, _ = self._run(monkeypatch, client)
+        assert metrics["tokens_in"] == config._estimate_tokens("prompt")
+        assert metrics["tokens_out"] == config._estimate_tokens("answer")
+        # The output count skipped the tokenizer after the first failure
+        assert client.counted == ["prompt"]
+
+    def test_estimate_uses_utf8_length(self):
+        assert config._estimate_tokens("") == 0
+        assert config._estimate_tokens("a") == 1
+        assert config._estimate_tokens("₹" * 12) > config._estimate_tokens("a" * 12)
+
+    def test_prompt_hash_is_short_blake2b(self, monkeypatch):
+        import hashlib
+
+        _, metrics, _ = self._run(monkeypatch, self._Client(None))
+        assert metrics["prompt_hash"] == hashlib.blake2b(b"prompt", digest_size=4).hexdigest()
+        assert len(metrics["prompt_hash"]) == 8
+
+
+class TestRetry:
+    """Tests for the shared sync retry loop."""
+
+    def test_rotates_keys_and_retries_rate_limits(self, monkeypatch):
+        keys = iter(["key-a", "key-b", "key-c"])
+        seen = []
+        monkeypatch.setattr(config, "_get_next_key", lambda: next(keys))
+        monkeypatch.setattr(config.time, "sleep", lambda s: None)
+
+        def call(api_key):
+            seen.append(api_key)
+            if len(seen) < 3:
+                raise RuntimeError("Error code: 429")
+            return "ok"
+
+        assert config._retry(call, max_attempts=4) == "ok"
+        assert seen == ["key-a", "key-b", "key-c"]
+
+    def test_other_errors_are_not_retried(self, monkeypatch):
+        monkeypatch.setattr(config, "_get_next_key", lambda: "key-a")
+        calls = []
+
+        def call(api_key):
+            calls.append(api_key)
+            raise KeyError("boom")
+
+        with pytest.raises(KeyError):
+            config._retry(call, max_attempts=4)
+        assert calls == ["key-a"]
+
+
+class TestSecretFilter:
+    """Tests for log redaction."""
+
+    @staticmethod
+    def _record(msg, level=logging.INFO):
+        return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+    def test_redacts_sensitive_messages_at_any_level(self):
+        record = self._record("Loaded GROQ_API_KEY=abc")
+        assert config.SecretFilter().filter(record) is True
+        assert record.msg.startswith("[REDACTED")
+
+    def test_leaves_other_messages(self):
+        record = self._record("Generated 3 files")
+        config.SecretFilter().filter(record)
+        assert record.msg == "Generated 3 files"
+
+
+class TestAIMDController:
+    """Tests for the adaptive concurrency window."""
+
+    def test_wait_for_slot_is_bounded(self):
+        aimd = config._AIMDController(initial=1, acquire_timeout_s=0.05)
+        aimd.acquire()
+        aimd.acquire()  # Window full: proceeds after the timeout
+        assert aimd.in_flight == 2
+
+    def test_successes_widen_and_rate_limits_halve(self):
+        aimd = config._AIMDController(c_min=1, c_max=6, initial=4, alpha=1.0, beta=0.5)
+        with aimd.slot():
+            pass
+        assert aimd.limit == 5.0
+
+        with pytest.raises(RuntimeError):
+            with aimd.slot():
+                raise RuntimeError("Error code: 429")
+        assert aimd.limit == 2.5
+        assert aimd.in_flight == 0
+
+    def test_window_bounds_and_other_errors(self):
+        aimd = config._AIMDController(c_min=1, c_max=2, initial=2, alpha=1.0, beta=0.1)
+        assert aimd.try_acquire() and aimd.try_acquire()
+        assert not aimd.try_acquire()
+        aimd.release(0.1)
+        aimd.release(None)  # Non-rate-limit failure: no change
+        assert aimd.limit == 2.0
+
+        aimd.in_flight = 1
+        aimd.release(None, throttled=True)
+        assert aimd.limit == 1.0
+
+    def test_slow_calls_shrink_the_window(self):
+        aimd = config._AIMDController(initial=4, target_latency_s=1.0, beta=0.5)
+        aimd.in_flight = 1
+        aimd.release(2.0)
+        assert aimd.limit == 2.0
+
+    def test_concurrent_rate_limits_cut_once(self):
+        aimd = config._AIMDController(initial=8, beta=0.5)
+        generations = [aimd.acquire() for _ in range(4)]
+        for generation in generations:
+            aimd.release(None, throttled=True, generation=generation)
+        assert aimd.limit == 4.0
+        assert aimd.in_flight == 0
+
+        # A call started after the cut can cut again
+        aimd.release(None, throttled=True, generation=aimd.acquire())
+        assert aimd.limit == 2.0
+
+
+class TestInvokeMemoized:
+    """Tests for the exact-prompt memo in invoke_memoized."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+
+        def fake_invoke(prompt, max_attempts=4):
+            calls.append(prompt)
+            if prompt == "fail":
+                raise RuntimeError("boom")
+            return f"echo: {prompt}"
+
+        monkeypatch.setattr(config, "invoke_with_retry", fake_invoke)
+        monkeypatch.setattr(config, "_prompt_memo", config.OrderedDict())
+        return calls
+
+    def test_repeated_prompt_skips_the_call(self, calls):
+        assert config.invoke_memoized("a") == "echo: a"
+        assert config.invoke_memoized("a") == "echo: a"
+        assert calls == ["a"]
+
+    def test_failures_are_not_stored(self, calls):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                config.invoke_memoized("fail")
+        assert calls == ["fail", "fail"]
+
+    def test_evicts_least_recently_used(self, calls, monkeypatch):
+        monkeypatch.setattr(config, "PROMPT_MEMO_SIZE", 2)
+        for prompt in ("a", "b", "a", "c", "a", "b"):
+            config.invoke_memoized(prompt)
+        assert calls == ["a", "b", "c", "b"]
+
+    def test_entries_expire(self, calls, monkeypatch):
+        monkeypatch.setattr(config, "PROMPT_MEMO_TTL_S", 0.0)
+        config.invoke_memoized("a")
+        config.invoke_memoized("a")
+        assert calls == ["a", "a"]
+
+    def test_rejected_responses_are_not_stored(self, calls):
+        def parse(text):
+            if not text.startswith("{"):
+                raise ValueError("not JSON")
+            return text
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                config.invoke_memoized("a", parse=parse)
+        assert calls == ["a", "a"]
+
+        # Accepted responses are stored and parsed again on a hit
+        assert config.invoke_memoized("a", parse=str.upper) == "ECHO: A"
+        assert config.invoke_memoized("a", parse=str.upper) == "ECHO: A"
+        assert calls == ["a", "a", "a"]
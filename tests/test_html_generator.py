@@ -0,0 +1,53 @@
+"""
+Tests for the HtmlGenerator preview service.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import HtmlGenerator
+
+
+class TestHtmlGenerator:
+    """Tests for HtmlGenerator rendering."""
+    
+    def test_renders_product_sections(self):
+        """Test that product, comparison and FAQ content reach the page."""
+        html = HtmlGenerator().generate(
+            {"product": {
+                "name": "Test Serum",
+                "benefits": {"detailed_benefits": [{"benefit": "Brightening", "description": "Evens tone"}]},
+                "how_to_use": {"expanded_instructions": {"steps": ["Apply daily"], "tips": []}},
+            }},
+            {"questions": [{"question": "Is it safe?", "answer": "Yes"}]},
+            {"products": {"product_b": {"name": "Other Serum", "key_features": ["A", "B"]}}},
+        )
+        
+        assert "<title>Test Serum</title>" in html
+        assert "<strong>Brightening</strong> — Evens tone" in html
+        assert '<li style="margin:8px 0;">Apply daily</li>' in html
+        assert "<div>A, B</div>" in html
+        assert "Is it safe?" in html
+    
+    def test_empty_inputs_use_placeholders(self):
+        """Test defaults when no data was generated."""
+        html = HtmlGenerator().generate({"product": {"benefits": []}}, {}, {})
+        
+        assert "<li>Quality product</li>" in html
+        assert "No FAQs generated" in html
+        assert "Everyone" in html
+    
+    def test_generated_text_is_escaped(self):
+        """Test that LLM-generated text cannot inject markup."""
+        html = HtmlGenerator().generate(
+            {"product": {"name": "<script>alert(1)</script>"}},
+            {"questions": [{"question": "<b>Q</b>", "answer": "a & b"}]},
+            {},
+        )
+        
+        assert "<script>alert(1)</script>" not in html
+        assert "&lt;script&gt;" in html
+        assert "&lt;b&gt;Q&lt;/b&gt;" in html
+        assert "a &amp; b" in html
@@ -121,3 +121,85 @@ class TestFAQMinimumQuestions:
         
         # Prompt should reference self.min_questions (15)
         assert "15" in prompt or str(agent.min_questions) in prompt
+
+
+class TestAsyncWorkflow:
+    """Tests for the async workflow entry point."""
+    
+    def test_arun_workflow_returns_state(self, sample_product_data):
+        """Test that arun_workflow runs the graph and reports progress."""
+        import asyncio
+        from orchestrator import arun_workflow
+        
+        progress_updates = []
+        
+        def callback(step, progress, metrics=None):
+            progress_updates.append((step, progress))
+        
+        result = asyncio.run(arun_workflow(sample_product_data, callback))
+        
+        assert isinstance(result, dict)
+        assert "errors" in result
+        assert "current_step" in result
+        steps = [step for step, _ in progress_updates]
+        assert "Parser Agent complete" in steps
+        assert "FAQ Agent complete" in steps
+    
+    def test_arun_workflow_awaits_async_callback(self, sample_product_data):
+        """Test that coroutine callbacks are awaited and see node start events."""
+        import asyncio
+        from orchestrator import arun_workflow
+        
+        steps = []
+        
+        async def callback(step, progress, metrics=None):
+            steps.append(step)
+        
+        asyncio.run(arun_workflow(sample_product_data, callback))
+        
+        assert steps[0] == "Initializing workflow..."
+        assert "Question Generator running..." in steps
+        assert steps.index("Question Generator running...") < steps.index("Question Generator complete")
+    
+    def test_arun_workflow_two_arg_async_callback(self, sample_product_data):
+        """Test that a coroutine callback without a metrics parameter still works."""
+        import asyncio
+        from orchestrator import arun_workflow
+        
+        steps = []
+        
+        async def callback(step, progress):
+            steps.append(step)
+        
+        result = asyncio.run(arun_workflow(sample_product_data, callback))
+        
+        assert not any("Workflow error" in e for e in result["errors"])
+        assert "Parser Agent complete" in steps
+        assert steps[-1] == "Completed"
+    
+    def test_failing_async_callback_does_not_fail_workflow(self, sample_product_data):
+        """Test that errors raised by a coroutine callback are logged, not fatal."""
+        import asyncio
+        from orchestrator import arun_workflow
+        
+        async def callback(step, progress, metrics=None):
+            raise RuntimeError("UI went away")
+        
+        result = asyncio.run(arun_workflow(sample_product_data, callback))
+        
+        assert not any("Workflow error" in e for e in result["errors"])
+    
+    def test_progress_is_monotonic(self, sample_product_data):
+        """Test that progress never moves backwards, even across parallel nodes."""
+        import asyncio
+        from orchestrator import arun_workflow
+        
+        progress_values = []
+        
+        def callback(step, progress, metrics=None):
+            progress_values.append(progress)
+        
+        asyncio.run(arun_workflow(sample_product_data, callback))
+        
+        assert progress_values == sorted(progress_values)
+        assert progress_values[-1] == 1.0